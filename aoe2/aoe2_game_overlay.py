@@ -4,6 +4,7 @@ import shutil
 from enum import Enum
 from threading import Event
 from random import choice
+from typing import Optional
 
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt, QUrl
@@ -169,7 +170,7 @@ class AoE2GameOverlay(RTSGameOverlay):
         if self.selected_panel == PanelID.CONFIG:
             # configuration selected build order
             if self.selected_build_order is not None:
-                self.build_order_search.setText(self.selected_build_order_name)
+                self.set_build_order_search_text(self.selected_build_order_name)
 
         self.update_panel_elements()  # update the elements of the panel to display
         self.update_position()  # restoring the upper right corner position
@@ -330,62 +331,74 @@ class AoE2GameOverlay(RTSGameOverlay):
             self.build_order_notes.add_row_from_picture_line(parent=self, line='No build order selected.')
 
         else:  # valid build order selected
-            selected_build_order_content = self.selected_build_order['build_order']
-
-            # select current step
             assert 0 <= self.selected_build_order_step_id < self.selected_build_order_step_count
-            selected_step = selected_build_order_content[self.selected_build_order_step_id]
-            assert selected_step is not None
-
-            # target resources
-            target_resources = selected_step['resources']
-            target_wood = get_total_on_resource(target_resources['wood'])
-            target_food = get_total_on_resource(target_resources['food'])
-            target_gold = get_total_on_resource(target_resources['gold'])
-            target_stone = get_total_on_resource(target_resources['stone'])
-            target_builder = get_total_on_resource(target_resources['builder']) if (
-                    'builder' in target_resources) else -1
-            target_villager = selected_step['villager_count']
-
-            # space between the resources
-            spacing = ''
-            layout = self.settings.layout
-            for i in range(layout.build_order.resource_spacing):
-                spacing += ' '
+            assert len(self.build_order_steps_display) == self.selected_build_order_step_count
+            step_display = self.build_order_steps_display[self.selected_build_order_step_id]
 
             # display selected step
-            self.build_order_step.setText(
-                f'Step: {self.selected_build_order_step_id + 1}/{self.selected_build_order_step_count}')
-
-            images = self.settings.images
-
-            # line to display the target resources
-            resources_line = images.wood + '@ ' + (str(target_wood) if (target_wood >= 0) else ' ')
-            resources_line += spacing + '@' + images.food + '@ ' + (str(target_food) if (target_food >= 0) else ' ')
-            resources_line += spacing + '@' + images.gold + '@ ' + (str(target_gold) if (target_gold >= 0) else ' ')
-            resources_line += spacing + '@' + images.stone + '@ ' + (
-                str(target_stone) if (target_stone >= 0) else ' ')
-            if target_builder > 0:  # add builders count if indicated
-                resources_line += spacing + '@' + images.builder + '@ ' + str(target_builder)
-            if target_villager >= 0:
-                resources_line += spacing + '@' + images.villager + '@ ' + str(target_villager)
-            if 1 <= selected_step['age'] <= 4:
-                resources_line += spacing + '@' + self.get_age_image(selected_step['age'])
-            if 'time' in selected_step:  # add time if indicated
-                resources_line += '@' + spacing + '@' + self.settings.images.time + '@' + selected_step['time']
-
-            # for dict type target_resources, create a tooltip to associate with the resource icon
-            mapping = {'wood': images.wood, 'food': images.food, 'gold': images.gold, 'stone': images.stone}
-            tooltip = dict((mapping[key], value) for (key, value) in target_resources.items() if type(value) is dict)
-            self.build_order_resources.add_row_from_picture_line(
-                parent=self, line=str(resources_line), tooltips=tooltip)
+            self.build_order_step.setText(step_display.step_text)
+
+            # target resources
+            self.build_order_resources.add_row_from_prepared_line(
+                parent=self, prepared_line=step_display.resources_line, tooltips=step_display.resources_tooltips)
 
             # notes of the current step
-            notes = selected_step['notes']
-            for note in notes:
-                self.build_order_notes.add_row_from_picture_line(parent=self, line=note)
+            for note_line in step_display.notes_lines:
+                self.build_order_notes.add_row_from_prepared_line(parent=self, prepared_line=note_line)
 
+        self.latency_probe.mark('update')
         self.build_order_panel_layout()  # update layout
+        self.latency_probe.mark('layout')
+
+    def get_build_order_resources_line(self, selected_step: dict) -> (str, dict):
+        """Get the line displaying the resources of a build order step
+
+        Parameters
+        ----------
+        selected_step    build order step
+
+        Returns
+        -------
+        line with images between @ markers
+        tooltips mapping the resource images to the sub resources content
+        """
+        # target resources
+        target_resources = selected_step['resources']
+        target_wood = get_total_on_resource(target_resources['wood'])
+        target_food = get_total_on_resource(target_resources['food'])
+        target_gold = get_total_on_resource(target_resources['gold'])
+        target_stone = get_total_on_resource(target_resources['stone'])
+        target_builder = get_total_on_resource(target_resources['builder']) if (
+                'builder' in target_resources) else -1
+        target_villager = selected_step['villager_count']
+
+        # space between the resources
+        spacing = ''
+        layout = self.settings.layout
+        for i in range(layout.build_order.resource_spacing):
+            spacing += ' '
+
+        images = self.settings.images
+
+        # line to display the target resources
+        resources_line = images.wood + '@ ' + (str(target_wood) if (target_wood >= 0) else ' ')
+        resources_line += spacing + '@' + images.food + '@ ' + (str(target_food) if (target_food >= 0) else ' ')
+        resources_line += spacing + '@' + images.gold + '@ ' + (str(target_gold) if (target_gold >= 0) else ' ')
+        resources_line += spacing + '@' + images.stone + '@ ' + (
+            str(target_stone) if (target_stone >= 0) else ' ')
+        if target_builder > 0:  # add builders count if indicated
+            resources_line += spacing + '@' + images.builder + '@ ' + str(target_builder)
+        if target_villager >= 0:
+            resources_line += spacing + '@' + images.villager + '@ ' + str(target_villager)
+        if 1 <= selected_step['age'] <= 4:
+            resources_line += spacing + '@' + self.get_age_image(selected_step['age'])
+        if 'time' in selected_step:  # add time if indicated
+            resources_line += '@' + spacing + '@' + self.settings.images.time + '@' + selected_step['time']
+
+        # for dict type target_resources, create a tooltip to associate with the resource icon
+        mapping = {'wood': images.wood, 'food': images.food, 'gold': images.gold, 'stone': images.stone}
+        tooltip = dict((mapping[key], value) for (key, value) in target_resources.items() if type(value) is dict)
+        return str(resources_line), tooltip
 
     def build_order_panel_layout(self):
         """Layout of the Build order panel"""
@@ -804,6 +817,18 @@ class AoE2GameOverlay(RTSGameOverlay):
             if self.selected_panel == PanelID.MATCH_DATA:
                 self.update_match_data_display()  # layout updated in function
 
+    def get_villager_reminder_interval(self) -> Optional[int]:
+        """Get the interval of the villager reminder timer
+
+        Returns
+        -------
+        interval [ms], None to pause the reminder (not active)
+        """
+        if self.selected_panel == PanelID.BUILD_ORDER and self.reminder_checkbox.is_checked():
+            return int((25 / 1.7) * 1000)  # 25 sec at 1.7 game speed in ms
+        else:
+            return None
+
     def timer_villager_reminder(self):
         """Function called on a timer to remind the player to make new villagers"""
         if self.selected_panel == PanelID.BUILD_ORDER and self.reminder_checkbox.is_checked():
@@ -3,11 +3,11 @@ from PyQt6.QtWidgets import QMainWindow, QLineEdit, QPushButton, QLabel
 from PyQt6.QtCore import Qt, QPoint, QSize
 from pathlib import Path
 import json
-from thefuzz import process
 
 from aoe2.aoe2_settings import AoE2OverlaySettings
 from common.useful_tools import set_background_opacity, widget_y_end
-from common.label_display import QLabelSettings, MultiQLabelDisplay
+from common.label_display import QLabelSettings, MultiQLabelDisplay, pixmap_cache
+from common.fuzzy_search import FuzzyScorer
 
 
 class CountersSearchWindow(QMainWindow):
@@ -41,6 +41,7 @@ class CountersSearchWindow(QMainWindow):
 
         with open(counter_path, 'r') as f:
             self.unit_counters = json.load(f)
+        self.unit_scorer = FuzzyScorer(self.unit_counters.keys())  # fuzzy search of the unit names
 
         # style to apply on the different parts
         style_description = f'color: rgb({settings.panel_build_order.color_font[0]}, {settings.panel_build_order.color_font[1]}, {settings.panel_build_order.color_font[2]})'
@@ -188,12 +189,11 @@ class CountersSearchWindow(QMainWindow):
                 self.search_results.append(unit)
 
         else:  # do a fuzzy search for matching build orders
-            self.search_results = [match[0] for match in process.extractBests(
+            self.search_results = self.unit_scorer.extract(
                 query=search_text,
-                choices=self.unit_counters.keys(),
                 score_cutoff=50,
                 limit=self.max_shown
-            )]
+            )
 
         # check all elements are unique
         assert len(set(self.search_results)) == len(self.search_results)
@@ -247,7 +247,7 @@ class CountersSearchWindow(QMainWindow):
         self.unit_counters_display.hide()
         self.unit_text.hide()
         self.unit_picture.hide()
-        self.unit_counters_display.labels = list()
+        self.unit_counters_display.clear()
         self.reset_selection()
 
         self.text_input.show()
@@ -271,9 +271,9 @@ class CountersSearchWindow(QMainWindow):
 
         if "image_name" in unit_info.keys():
 
-            pixmap: QPixmap = QPixmap((self.unit_icons_folder / unit_info["image_name"]).as_posix())
-            self.unit_picture.setPixmap(pixmap.scaledToHeight(self.unit_counters_display.image_height,
-                                                              mode=Qt.TransformationMode.SmoothTransformation))
+            pixmap: QPixmap = pixmap_cache.get((self.unit_icons_folder / unit_info["image_name"]).as_posix(),
+                                               image_height=self.unit_counters_display.image_height)
+            self.unit_picture.setPixmap(pixmap)
             self.unit_picture.move(QPoint(next_x, self.back_button.y()))
             self.unit_picture.adjustSize()
             next_x = self.unit_picture.x() + self.unit_picture.width() + self.settings.layout.action_button_spacing
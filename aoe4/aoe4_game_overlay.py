@@ -199,7 +199,7 @@ class AoE4GameOverlay(RTSGameOverlay):
         if self.selected_panel == PanelID.CONFIG:
             # configuration selected build order
             if self.selected_build_order is not None:
-                self.build_order_search.setText(self.selected_build_order_name)
+                self.set_build_order_search_text(self.selected_build_order_name)
 
         self.update_panel_elements()  # update the elements of the panel to display
         self.update_position()  # restoring the upper right corner position
@@ -386,57 +386,70 @@ class AoE4GameOverlay(RTSGameOverlay):
             self.build_order_notes.add_row_from_picture_line(parent=self, line='No build order selected.')
 
         else:  # valid build order selected
-            selected_build_order_content = self.selected_build_order['build_order']
-
-            # select current step
             assert 0 <= self.selected_build_order_step_id < self.selected_build_order_step_count
-            selected_step = selected_build_order_content[self.selected_build_order_step_id]
-            assert selected_step is not None
-
-            # target resources
-            target_resources = selected_step['resources']
-            target_food = target_resources['food']
-            target_wood = target_resources['wood']
-            target_gold = target_resources['gold']
-            target_stone = target_resources['stone']
-            target_villager = selected_step['villager_count']
-            target_population = selected_step['population_count']
-
-            # space between the resources
-            spacing = ''
-            layout = self.settings.layout
-            for i in range(layout.build_order.resource_spacing):
-                spacing += ' '
+            assert len(self.build_order_steps_display) == self.selected_build_order_step_count
+            step_display = self.build_order_steps_display[self.selected_build_order_step_id]
 
             # display selected step
-            self.build_order_step.setText(
-                f'Step: {self.selected_build_order_step_id + 1}/{self.selected_build_order_step_count}')
-
-            images = self.settings.images
-
-            # line to display the target resources
-            resources_line = images.food + '@ ' + (str(target_food) if (target_food >= 0) else ' ')
-            resources_line += spacing + '@' + images.wood + '@ ' + (str(target_wood) if (target_wood >= 0) else ' ')
-            resources_line += spacing + '@' + images.gold + '@ ' + (str(target_gold) if (target_gold >= 0) else ' ')
-            resources_line += spacing + '@' + images.stone + '@ ' + (
-                str(target_stone) if (target_stone >= 0) else ' ')
-            if target_villager >= 0:
-                resources_line += spacing + '@' + images.villager + '@ ' + str(target_villager)
-            if target_population >= 0:
-                resources_line += spacing + '@' + images.population + '@ ' + str(target_population)
-            if 1 <= selected_step['age'] <= 4:
-                resources_line += spacing + '@' + self.get_age_image(selected_step['age'])
-            if 'time' in selected_step:  # add time if indicated
-                resources_line += '@' + spacing + '@' + self.settings.images.time + '@' + selected_step['time']
-
-            self.build_order_resources.add_row_from_picture_line(parent=self, line=str(resources_line))
+            self.build_order_step.setText(step_display.step_text)
+
+            # target resources
+            self.build_order_resources.add_row_from_prepared_line(
+                parent=self, prepared_line=step_display.resources_line)
 
             # notes of the current step
-            notes = selected_step['notes']
-            for note in notes:
-                self.build_order_notes.add_row_from_picture_line(parent=self, line=note)
+            for note_line in step_display.notes_lines:
+                self.build_order_notes.add_row_from_prepared_line(parent=self, prepared_line=note_line)
 
+        self.latency_probe.mark('update')
         self.build_order_panel_layout()  # update layout
+        self.latency_probe.mark('layout')
+
+    def get_build_order_resources_line(self, selected_step: dict) -> (str, None):
+        """Get the line displaying the resources of a build order step
+
+        Parameters
+        ----------
+        selected_step    build order step
+
+        Returns
+        -------
+        line with images between @ markers
+        None (no tooltip)
+        """
+        # target resources
+        target_resources = selected_step['resources']
+        target_food = target_resources['food']
+        target_wood = target_resources['wood']
+        target_gold = target_resources['gold']
+        target_stone = target_resources['stone']
+        target_villager = selected_step['villager_count']
+        target_population = selected_step['population_count']
+
+        # space between the resources
+        spacing = ''
+        layout = self.settings.layout
+        for i in range(layout.build_order.resource_spacing):
+            spacing += ' '
+
+        images = self.settings.images
+
+        # line to display the target resources
+        resources_line = images.food + '@ ' + (str(target_food) if (target_food >= 0) else ' ')
+        resources_line += spacing + '@' + images.wood + '@ ' + (str(target_wood) if (target_wood >= 0) else ' ')
+        resources_line += spacing + '@' + images.gold + '@ ' + (str(target_gold) if (target_gold >= 0) else ' ')
+        resources_line += spacing + '@' + images.stone + '@ ' + (
+            str(target_stone) if (target_stone >= 0) else ' ')
+        if target_villager >= 0:
+            resources_line += spacing + '@' + images.villager + '@ ' + str(target_villager)
+        if target_population >= 0:
+            resources_line += spacing + '@' + images.population + '@ ' + str(target_population)
+        if 1 <= selected_step['age'] <= 4:
+            resources_line += spacing + '@' + self.get_age_image(selected_step['age'])
+        if 'time' in selected_step:  # add time if indicated
+            resources_line += '@' + spacing + '@' + self.settings.images.time + '@' + selected_step['time']
+
+        return str(resources_line), None
 
     def build_order_panel_layout(self):
         """Layout of the Build order panel"""
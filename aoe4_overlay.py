@@ -1,26 +1,23 @@
 # Game overlay application for Age of Empires IV (AoE4)
 import sys
 import pathlib
+from multiprocessing import freeze_support
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QTimer
 
 from aoe4.aoe4_game_overlay import AoE4GameOverlay
 
 if __name__ == '__main__':
+    freeze_support()  # processes used to load the build orders (executable version)
     App = QApplication(sys.argv)
     window = AoE4GameOverlay(directory_main=str(pathlib.Path(__file__).parent.resolve()))
 
+    scheduler = window.timer_scheduler  # timers with intervals adapted to the overlay state
+
     # timer to call the functions related to mouse and keyboard inputs
-    timer_mouse = QTimer()
-    timer_mouse.timeout.connect(window.timer_mouse_keyboard_call)
-    timer_mouse.setInterval(window.settings.mouse_call_ms)
-    timer_mouse.start()
+    scheduler.add_timer(window.timer_mouse_keyboard_call, window.get_mouse_timer_interval)
 
     # timer to call the functions related to match data
-    timer_match_data = QTimer()
-    timer_match_data.timeout.connect(window.timer_match_data_call)
-    timer_match_data.setInterval(window.settings.match_data_call_ms)
-    timer_match_data.start()
+    scheduler.add_timer(window.timer_match_data_call, lambda: window.settings.match_data_call_ms)
 
     exit_event = App.exec()
     sys.exit(exit_event)
@@ -0,0 +1,215 @@
+import os
+import sys
+import json
+import mmap
+import struct
+
+from PyQt6.QtGui import QPixmap
+from PyQt6.QtCore import Qt, QBuffer, QByteArray, QIODevice
+from typing import Optional
+
+ASSET_PACK_NAME = 'pictures.pack'  # name of the asset pack file, located in the pictures folder it covers
+ASSET_PACK_MAGIC = b'RTSPACK2'  # first bytes of an asset pack file (version of its format)
+ASSET_PACK_HEADER = struct.Struct('<8sQ')  # magic bytes and size of the JSON index
+
+
+def get_asset_pack_path(folder: str) -> str:
+    """Get the path of the asset pack covering a pictures folder
+
+    Parameters
+    ----------
+    folder    folder where the pictures are located
+
+    Returns
+    -------
+    path of the asset pack file
+    """
+    return os.path.join(folder, ASSET_PACK_NAME)
+
+
+def get_source_state(image_path: str) -> Optional[tuple]:
+    """Get the state of a source picture, to detect its modifications
+
+    Parameters
+    ----------
+    image_path    path of the picture
+
+    Returns
+    -------
+    (modification time [ns], size) of the picture, None if unavailable
+    """
+    try:
+        file_stat = os.stat(image_path)
+        return file_stat.st_mtime_ns, file_stat.st_size
+    except OSError:
+        return None
+
+
+def build_asset_pack(folder: str, image_heights: list, output_file: str = None) -> int:
+    """Pre-scale all the pictures of a folder (including its sub-folders) and pack them in a single file
+
+    The file starts with a header (magic bytes and index size), followed by a JSON index
+    {'heights': [height, ...], 'images': {relative path: {'state': [modification time, size],
+    'heights': {height: [offset, size]}}}} and the PNG data of the scaled pictures (offsets relative to the end
+    of the index). The state of each source picture is used to detect the pictures modified after packing them.
+
+    Parameters
+    ----------
+    folder           folder where the pictures are located
+    image_heights    heights of the scaled pictures
+    output_file      path of the asset pack, None for the default one inside the folder
+
+    Returns
+    -------
+    number of pictures packed
+    """
+    if output_file is None:
+        output_file = get_asset_pack_path(folder)
+
+    images = dict()  # index of the images
+    data = bytearray()  # scaled pictures in PNG format
+
+    for root, _, files in os.walk(folder):
+        for file_name in sorted(files):
+            full_path = os.path.join(root, file_name)
+            if os.path.abspath(full_path) == os.path.abspath(output_file):
+                continue
+            pixmap = QPixmap(full_path)  # scaled as pixmap, to get the same result as without asset pack
+            if pixmap.isNull():  # not a picture
+                continue
+
+            # same key as for the pictures folder index, but with '/' separators
+            relative_path = os.path.normcase(os.path.relpath(full_path, folder)).replace(os.sep, '/')
+            images[relative_path] = {'state': list(get_source_state(full_path)), 'heights': dict()}
+            for image_height in image_heights:
+                scaled_image = pixmap.scaledToHeight(image_height, mode=Qt.TransformationMode.SmoothTransformation)
+                byte_array = QByteArray()
+                buffer = QBuffer(byte_array)
+                buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+                scaled_image.save(buffer, 'PNG')
+                buffer.close()
+                images[relative_path]['heights'][str(image_height)] = [len(data), byte_array.size()]
+                data += byte_array.data()
+
+    index = json.dumps({'heights': list(image_heights), 'images': images}, separators=(',', ':')).encode('utf-8')
+    with open(output_file, 'wb') as f:
+        f.write(ASSET_PACK_HEADER.pack(ASSET_PACK_MAGIC, len(index)))
+        f.write(index)
+        f.write(data)
+
+    print(f'Asset pack {output_file}: {len(images)} pictures, {len(data) // 1024} kB.')
+    return len(images)
+
+
+class AssetPack:
+    """Pre-scaled pictures read from an asset pack file (see 'build_asset_pack')"""
+
+    def __init__(self, pack_file: str):
+        """Constructor
+
+        Parameters
+        ----------
+        pack_file    path of the asset pack file
+        """
+        with open(pack_file, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # memory-mapped file content
+
+        magic, index_size = ASSET_PACK_HEADER.unpack_from(self.data, 0)
+        if magic != ASSET_PACK_MAGIC:
+            self.data.close()
+            raise ValueError(f'Invalid asset pack file: {pack_file}')
+        index_start = ASSET_PACK_HEADER.size
+        index = json.loads(self.data[index_start:index_start + index_size].decode('utf-8'))
+        self.data_start = index_start + index_size  # start of the pictures data
+        self.heights = set(index['heights'])
+        self.images = index['images']
+
+    def get_pixmap(self, relative_path: str, image_height: int, image_path: str) -> Optional[QPixmap]:
+        """Get a pre-scaled picture
+
+        Parameters
+        ----------
+        relative_path    normalized path of the picture, relative to the pictures folder, with '/' separators
+        image_height     height of the picture
+        image_path       path of the source picture, to check it was not modified since packed
+
+        Returns
+        -------
+        requested pixmap, None if not in the asset pack or if the source picture was modified
+        """
+        if image_height not in self.heights:
+            return None
+        image = self.images.get(relative_path)
+        if image is None:
+            return None
+        source_state = get_source_state(image_path)
+        if (source_state is None) or (list(source_state) != image['state']):  # picture modified since packed
+            return None
+        offset, size = image['heights'][str(image_height)]
+        offset += self.data_start
+
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(self.data[offset:offset + size], 'PNG'):
+            return None
+        return pixmap
+
+
+# asset packs as {normalized absolute pictures folder: AssetPack}, shared by all the displays
+asset_packs = dict()
+
+
+def load_asset_pack(folder: str):
+    """Load the asset pack of a pictures folder, if available and not already loaded
+
+    Parameters
+    ----------
+    folder    folder where the pictures are located
+    """
+    folder_key = os.path.normcase(os.path.abspath(folder))
+    if folder_key in asset_packs:
+        return
+
+    pack_file = get_asset_pack_path(folder)
+    if os.path.isfile(pack_file):
+        try:
+            asset_packs[folder_key] = AssetPack(pack_file)
+        except (OSError, ValueError, struct.error) as e:
+            print(f'Could not load the asset pack {pack_file}: {e}')
+
+
+def get_packed_pixmap(image_path: str, image_height: int) -> Optional[QPixmap]:
+    """Get a pre-scaled picture from the loaded asset packs
+
+    Parameters
+    ----------
+    image_path      path of the picture (in its pictures folder)
+    image_height    height of the picture
+
+    Returns
+    -------
+    requested pixmap, None if not available in the asset packs
+    """
+    if len(asset_packs) == 0:
+        return None
+
+    image_path = os.path.normcase(os.path.abspath(image_path))
+    for folder_key, asset_pack in asset_packs.items():
+        if image_path.startswith(folder_key + os.sep):
+            relative_path = image_path[len(folder_key) + 1:].replace(os.sep, '/')
+            pixmap = asset_pack.get_pixmap(relative_path, image_height, image_path)
+            if pixmap is not None:
+                return pixmap
+    return None
+
+
+if __name__ == '__main__':  # to run from the root folder: python -m common.asset_pack
+    from PyQt6.QtGui import QGuiApplication
+    from common.rts_settings import RTSBuildOrderLayout
+
+    app = QGuiApplication(sys.argv)
+
+    # pre-scale the pictures to the default build order image height
+    default_heights = [RTSBuildOrderLayout().image_height]
+    for pictures_folder in ['pictures/common', 'pictures/aoe2', 'pictures/aoe4']:
+        if os.path.isdir(pictures_folder):
+            build_asset_pack(pictures_folder, default_heights)
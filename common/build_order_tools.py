@@ -1,29 +1,786 @@
+import io
+import heapq
+import os
 import json
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from collections import Counter, OrderedDict
+from threading import Thread, Event
+from typing import Optional
+from thefuzz.utils import full_process
 from common.useful_tools import list_directory_files
+from common.fuzzy_search import FuzzyScorer
 
+BUILD_ORDERS_CACHE_VERSION = 3  # to increase when the cached build orders content or their validation change
 
-def is_build_order_new(existing_build_orders: list, new_build_order_data: dict, category_name: str = None) -> bool:
-    """Check if a build order is new
+
+class BuildOrderHeader(dict):
+    """Build order data without its steps, which are only loaded when needed"""
+
+    def __init__(self, build_order: dict, build_order_file: str, step_count: int = None):
+        """Constructor
+
+        Parameters
+        ----------
+        build_order         valid build order data (steps in the 'build_order' field),
+                            or only its header fields if 'step_count' is provided
+        build_order_file    JSON file where the build order is stored
+        step_count          number of steps of the build order, None to count them in 'build_order'
+        """
+        super().__init__((key, value) for key, value in build_order.items() if key != 'build_order')
+        self.file = build_order_file
+        self.step_count = len(build_order['build_order']) if (step_count is None) else step_count
+
+    def load(self, check_valid_build_order) -> Optional[dict]:
+        """Load the full build order (including its steps) from its file
+
+        Parameters
+        ----------
+        check_valid_build_order    function to check if a build order is valid (file possibly modified since read)
+
+        Returns
+        -------
+        build order data, None if the file does not contain this valid build order anymore
+        """
+        try:
+            with open(self.file, 'rb') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            data = None
+
+        if (not isinstance(data, dict)) or (data.get('name') != self['name']) or (
+                not isinstance(data.get('build_order'), list)) or (len(data['build_order']) == 0) or (
+                not check_valid_build_order(data)):
+            name = self['name']
+            print(f'Build order \'{name}\' could not be loaded from \'{self.file}\'.')
+            return None
+        return data
+
+
+class BuildOrderRegistry:
+    """Build orders indexed by name (and category), iterated in their adding order"""
+
+    def __init__(self, category_name: str = None):
+        """Constructor
+
+        Parameters
+        ----------
+        category_name    if not None, accept build orders with same name, if they are in different categories
+        """
+        self.category_name = category_name
+        self.build_orders = dict()  # build orders as {(name, category): data}, in adding order
+        self.names = dict()  # build orders with the same name as {name: [data, ...]}, in adding order
+        self.version = 0  # increased each time the content changes
+        self.sequence = dict()  # adding order of the build orders as {(name, category): sequence number}
+        self.sequence_count = 0  # sequence number of the next build order added
+        self.key_indexes = dict()  # indexes of the key values, built on demand (see 'get_key_index')
+
+    def __len__(self) -> int:
+        return len(self.build_orders)
+
+    def __iter__(self):
+        return iter(self.build_orders.values())
+
+    def get_key(self, build_order: dict) -> Optional[tuple]:
+        """Get the key identifying a build order in the registry
+
+        Parameters
+        ----------
+        build_order    build order data
+
+        Returns
+        -------
+        (name, category) of the build order, with None category if no category name,
+        None if not a dictionary, if the name is missing or not a string, or if the category is missing or cannot
+        be hashed
+        """
+        if not isinstance(build_order, dict):
+            return None
+        name = build_order.get('name')
+        if not isinstance(name, str):
+            return None
+        if self.category_name is None:
+            return name, None
+        if self.category_name not in build_order:
+            return None
+        category = build_order[self.category_name]
+        if isinstance(category, list):  # lists cannot be hashed
+            category = tuple(category)
+        try:
+            hash(category)
+        except TypeError:
+            return None
+        return name, category
+
+    def is_valid_key(self, build_order: dict) -> bool:
+        """Check if the name (and category) of a build order can identify it in the registry
+
+        Parameters
+        ----------
+        build_order    build order data
+
+        Returns
+        -------
+        True if valid name (and category)
+        """
+        return self.get_key(build_order) is not None
+
+    def is_new(self, build_order: dict) -> bool:
+        """Check if a build order is new
+
+        Parameters
+        ----------
+        build_order    build order data
+
+        Returns
+        -------
+        True if no build order with the same name (and category) in the registry, False if already there
+        or not valid (see 'is_valid_key')
+        """
+        key = self.get_key(build_order)
+        return (key is not None) and (key not in self.build_orders)
+
+    def add(self, build_order: dict) -> bool:
+        """Add a build order, if it is new
+
+        Parameters
+        ----------
+        build_order    build order data
+
+        Returns
+        -------
+        True if added, False if already in the registry or not valid (see 'is_valid_key')
+        """
+        key = self.get_key(build_order)
+        if (key is None) or (key in self.build_orders):
+            return False
+        self.build_orders[key] = build_order
+        self.names.setdefault(key[0], []).append(build_order)
+        self.sequence[key] = self.sequence_count
+        self.sequence_count += 1
+        for index_key, key_index in self.key_indexes.items():
+            self.update_key_index(key_index, index_key, key, build_order, add=True)
+        self.version += 1
+        return True
+
+    def remove(self, build_order: dict) -> bool:
+        """Remove a build order
+
+        Parameters
+        ----------
+        build_order    build order data (only its name and category are used)
+
+        Returns
+        -------
+        True if removed, False if not in the registry
+        """
+        key = self.get_key(build_order)
+        removed = self.build_orders.pop(key, None) if (key is not None) else None
+        if removed is None:
+            return False
+        same_name = self.names[key[0]]
+        same_name.remove(removed)
+        if len(same_name) == 0:
+            del self.names[key[0]]
+        del self.sequence[key]
+        for index_key, key_index in self.key_indexes.items():
+            self.update_key_index(key_index, index_key, key, removed, add=False)
+        self.version += 1
+        return True
+
+    def get(self, name: str, key_condition: dict = None) -> Optional[dict]:
+        """Get the first added build order with a given name (and key conditions)
+
+        Parameters
+        ----------
+        name             name of the build order
+        key_condition    dictionary with the keys to look for and their value (to consider as valid), None to skip it
+
+        Returns
+        -------
+        build order data, None if not found
+        """
+        for build_order in self.names.get(name, []):
+            if check_build_order_key_values(build_order, key_condition):
+                return build_order
+        return None
+
+    @staticmethod
+    def update_key_index(key_index: dict, index_key: str, key: tuple, build_order: dict, add: bool):
+        """Add or remove a build order in the index of a key
+
+        Parameters
+        ----------
+        key_index      index to update (see 'get_key_index')
+        index_key      key of the build order data indexed
+        key            key of the build order in the registry
+        build_order    build order data
+        add            True to add the build order, False to remove it
+        """
+        if index_key not in build_order:
+            groups = [key_index['missing']]
+        else:
+            value = build_order[index_key]
+            values = value if isinstance(value, list) else [value]  # build order matching any value of a list
+            try:
+                groups = [key_index['values'].setdefault(x, set()) for x in values]
+            except TypeError:  # values which cannot be hashed
+                groups = [key_index['other']]
+
+        for group in groups:
+            if add:
+                group.add(key)
+            else:
+                group.discard(key)
+
+    def get_key_index(self, index_key: str) -> dict:
+        """Get the index of the values of a key, building it on the first call
+
+        Parameters
+        ----------
+        index_key    key of the build order data to index
+
+        Returns
+        -------
+        index as {'values': {value: {build order key, ...}}, 'missing': {build order key without this data key, ...},
+                  'other': {build order key with values which cannot be hashed, ...}}
+        """
+        key_index = self.key_indexes.get(index_key)
+        if key_index is None:
+            key_index = {'values': dict(), 'missing': set(), 'other': set()}
+            for key, build_order in self.build_orders.items():
+                self.update_key_index(key_index, index_key, key, build_order, add=True)
+            self.key_indexes[index_key] = key_index
+        return key_index
+
+    def get_matching_keys(self, key_condition: dict) -> set:
+        """Get the keys of the build orders fulfilling key conditions (see 'check_build_order_key_values')
+
+        Parameters
+        ----------
+        key_condition    dictionary with the keys to look for and their value (to consider as valid)
+
+        Returns
+        -------
+        set of the (name, category) keys of the matching build orders
+        """
+        matching_keys = None
+        for index_key, value in key_condition.items():
+            key_index = self.get_key_index(index_key)
+            try:
+                condition_keys = key_index['values'].get(value, set()) | key_index['missing']
+            except TypeError:  # value which cannot be hashed
+                condition_keys = set(key for key, build_order in self.build_orders.items() if (
+                        index_key not in build_order) or check_build_order_key_values(build_order, {index_key: value}))
+            condition_keys.update(key for key in key_index['other'] if check_build_order_key_values(
+                self.build_orders[key], {index_key: value}))
+
+            matching_keys = condition_keys if (matching_keys is None) else (matching_keys & condition_keys)
+        return matching_keys if (matching_keys is not None) else set(self.build_orders.keys())
+
+    def get_matching(self, key_condition: dict = None) -> list:
+        """Get the build orders fulfilling key conditions (see 'check_build_order_key_values')
+
+        Parameters
+        ----------
+        key_condition    dictionary with the keys to look for and their value (to consider as valid), None to skip it
+
+        Returns
+        -------
+        matching build orders, in adding order
+        """
+        if key_condition is None:
+            return list(self.build_orders.values())
+        return [self.build_orders[key] for key in sorted(self.get_matching_keys(key_condition),
+                                                         key=self.sequence.__getitem__)]
+
+
+def get_search_terms(processed_name: str) -> set:
+    """Get the terms (words and character trigrams) of a processed name, used to index the build orders
+
+    Parameters
+    ----------
+    processed_name    name processed by 'full_process' (lower case, only letters, digits and spaces)
+
+    Returns
+    -------
+    set of terms, words being prefixed by a space to distinguish them from the trigrams
+    """
+    padded_name = f' {processed_name} '
+    terms = set(padded_name[i:i + 3] for i in range(len(padded_name) - 2))
+    terms.update(' ' + word for word in processed_name.split())
+    return terms
+
+
+class BuildOrderSearchIndex:
+    """Index of the build order names, to shortlist the candidates of a fuzzy search before scoring them"""
+
+    def __init__(self, build_orders: BuildOrderRegistry, shortlist_size: int = 256, cache_size: int = 32):
+        """Constructor
+
+        Parameters
+        ----------
+        build_orders      registry of the build orders to index
+        shortlist_size    maximal number of candidates to score, all of them scored if fewer build orders
+        cache_size        maximal number of search results kept in memory
+        """
+        self.registry = build_orders
+        self.version = build_orders.version  # version of the registry when indexed
+        self.shortlist_size = shortlist_size
+        self.cache_size = cache_size
+        # last search results as {search key: names}, discarded with the index when the build orders change
+        self.search_cache = OrderedDict()
+        self.build_orders = list(build_orders)  # build orders in the registry order
+        self.names = [build_order['name'] for build_order in self.build_orders]
+        self.positions = {build_orders.get_key(build_order): position for position, build_order in
+                          enumerate(self.build_orders)}  # as {(name, category): position in 'build_orders'}
+        self.lower_names = [name.lower() for name in self.names]
+        self.scorer = FuzzyScorer(self.names)  # fuzzy scoring of the names
+        self.previous_words_search = None  # last words search as (search string, IDs of all the matches)
+
+        self.postings = dict()  # IDs of the build orders (increasing) for each term as {term: [ID, ...]}
+        for build_order_id, name in enumerate(self.names):
+            for term in get_search_terms(full_process(name)):
+                self.postings.setdefault(term, []).append(build_order_id)
+
+    def is_up_to_date(self, build_orders: BuildOrderRegistry) -> bool:
+        """Check if the index matches the current content of a registry
+
+        Parameters
+        ----------
+        build_orders    registry of the build orders
+
+        Returns
+        -------
+        True if the index can be used for this registry
+        """
+        return (build_orders is self.registry) and (build_orders.version == self.version)
+
+    def get_cached_search(self, search_key: Optional[tuple]) -> Optional[list]:
+        """Get the result of a previous search
+
+        Parameters
+        ----------
+        search_key    key identifying the search (query and parameters), None if it cannot be cached
+
+        Returns
+        -------
+        names found by the search, None if not in the cache
+        """
+        if (search_key is None) or (search_key not in self.search_cache):
+            return None
+        self.search_cache.move_to_end(search_key)  # most recently used
+        return list(self.search_cache[search_key])
+
+    def cache_search(self, search_key: Optional[tuple], names: list):
+        """Store the result of a search, removing the least recently used one if the cache is full
+
+        Parameters
+        ----------
+        search_key    key identifying the search (query and parameters), None if it cannot be cached
+        names         names found by the search
+        """
+        if search_key is None:
+            return
+        self.search_cache[search_key] = list(names)
+        if len(self.search_cache) > self.cache_size:
+            self.search_cache.popitem(last=False)
+
+    def search(self, search_string: str, score_cutoff: int, limit: int, key_condition: dict = None) -> list:
+        """Fuzzy search of the build orders names
+
+        Parameters
+        ----------
+        search_string    string to search
+        score_cutoff     minimal score of the fuzzy search
+        limit            maximal number of names returned
+        key_condition    dictionary with the keys to look for and their value (to consider as valid), None to skip it
+
+        Returns
+        -------
+        names of the best matches, best first
+        """
+        search_key = ('fuzz', search_string, score_cutoff, limit, None if (key_condition is None) else tuple(
+            sorted(key_condition.items())))
+        try:
+            hash(search_key)
+        except TypeError:  # key condition value which cannot be hashed
+            search_key = None
+        cached_names = self.get_cached_search(search_key)
+        if cached_names is not None:
+            return cached_names
+
+        build_order_ids = range(len(self.build_orders))
+        if key_condition is not None:  # only keep build orders with valid key conditions
+            build_order_ids = sorted(self.positions[key] for key in self.registry.get_matching_keys(key_condition))
+
+        if len(build_order_ids) > self.shortlist_size:  # shortlist the build orders sharing most terms
+            valid_ids = set(build_order_ids) if (key_condition is not None) else None
+            term_counts = Counter()
+            for term in get_search_terms(full_process(search_string)):
+                term_counts.update(self.postings.get(term, []))
+            if valid_ids is not None:
+                term_counts = Counter({x: count for x, count in term_counts.items() if x in valid_ids})
+            build_order_ids = sorted(x for x, _ in heapq.nsmallest(  # first build orders kept in case of equality
+                self.shortlist_size, term_counts.items(), key=lambda x: (-x[1], x[0])))
+
+        names = self.scorer.extract(search_string, score_cutoff=score_cutoff, limit=limit,
+                                    choice_ids=build_order_ids)
+        self.cache_search(search_key, names)
+        return names
+
+    def search_words(self, search_string: str, limit: int) -> list:
+        """Search of the build orders names containing all the words of a search (case insensitive)
+
+        Parameters
+        ----------
+        search_string    string to search, with words separated by spaces
+        limit            maximal number of names returned
+
+        Returns
+        -------
+        names of the matches, in the registry order
+        """
+        search_key = ('words', search_string, limit)
+        cached_names = self.get_cached_search(search_key)
+        if cached_names is not None:
+            return cached_names
+
+        # extending the previous search can only remove matches
+        if (self.previous_words_search is not None) and search_string.startswith(self.previous_words_search[0]):
+            candidate_ids = self.previous_words_search[1]
+        else:
+            candidate_ids = range(len(self.names))
+
+        search_split = search_string.lower().split(' ')  # split according to spaces
+        matching_ids = [x for x in candidate_ids if all(
+            search_part in self.lower_names[x] for search_part in search_split)]
+
+        self.previous_words_search = (search_string, matching_ids)
+        names = [self.names[x] for x in matching_ids[:limit]]
+        self.cache_search(search_key, names)
+        return names
+
+
+def get_build_orders_cache_key(check_valid_build_order, category_name: str = None) -> tuple:
+    """Get the key identifying the settings used to fill a build orders cache
+
+    Parameters
+    ----------
+    check_valid_build_order    function to check if a build order is valid
+    category_name              category name used for the build orders, None if no category
+
+    Returns
+    -------
+    key to store in the cache file (JSON compatible)
+    """
+    return [BUILD_ORDERS_CACHE_VERSION, check_valid_build_order.__module__, check_valid_build_order.__qualname__,
+            category_name]
+
+
+def get_cache_entry(build_order_file, cached, category_name: str = None) -> Optional[tuple]:
+    """Get a build order from an entry of the cache file, checking its content (see 'load_build_orders_cache')
+
+    Parameters
+    ----------
+    build_order_file    build order file of the entry
+    cached              cached data of the entry, expected as
+                        [modification time, size, build order header fields, number of steps]
+    category_name       category name expected in the build order, None if no category
+
+    Returns
+    -------
+    (modification time, size, build order header), None if invalid entry
+    """
+    if not (isinstance(build_order_file, str) and isinstance(cached, list) and (len(cached) == 4)):
+        return None
+    modification_time, size, header_fields, step_count = cached
+    if not (isinstance(modification_time, int) and isinstance(size, int) and isinstance(header_fields, dict) and
+            isinstance(step_count, int) and (step_count > 0)):
+        return None
+    if ('name' not in header_fields) or ((category_name is not None) and (category_name not in header_fields)):
+        return None
+    header = BuildOrderHeader(header_fields, build_order_file, step_count)
+    if not BuildOrderRegistry(category_name).is_valid_key(header):
+        return None
+    return modification_time, size, header
+
+
+def load_build_orders_cache(cache_file: str, cache_key: tuple) -> dict:
+    """Load the valid build orders stored in a cache file
+
+    Parameters
+    ----------
+    cache_file    cache file to load
+    cache_key     key of the expected cache (see 'get_build_orders_cache_key')
+
+    Returns
+    -------
+    cached build orders as {build order file: (modification time, size, build order header)}, empty if no valid cache
+    """
+    if not os.path.isfile(cache_file):
+        return dict()
+    try:
+        with open(cache_file, 'rb') as f:
+            cache = json.load(f)
+    except (OSError, ValueError) as e:  # JSON decoding errors included
+        print(f'Could not read the build orders cache {cache_file}: {e}')
+        return dict()
+
+    if isinstance(cache, dict) and (cache.get('key') == cache_key) and isinstance(cache.get('build_orders'), dict):
+        # check the content, in case the file is damaged
+        category_name = cache_key[-1]
+        build_orders = dict()
+        for build_order_file, cached in cache['build_orders'].items():
+            entry = get_cache_entry(build_order_file, cached, category_name)
+            if entry is None:
+                print(f'Invalid content in the build orders cache {cache_file}, ignoring it.')
+                return dict()
+            build_orders[build_order_file] = entry
+        return build_orders
+    return dict()
+
+
+def save_build_orders_cache(cache_file: str, cache_key: tuple, build_orders: dict):
+    """Save the valid build orders in a cache file
+
+    Parameters
+    ----------
+    cache_file      cache file to write
+    cache_key       key of the cache (see 'get_build_orders_cache_key')
+    build_orders    build orders as {build order file: (modification time, size, build order header)}
+    """
+    # stored as {build order file: [modification time, size, build order header fields, number of steps]}
+    cached_build_orders = {build_order_file: [modification_time, size, header, header.step_count]
+                           for build_order_file, (modification_time, size, header) in build_orders.items()}
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        temporary_file = cache_file + '.tmp'
+        with open(temporary_file, 'w', encoding='utf-8') as f:
+            json.dump({'key': cache_key, 'build_orders': cached_build_orders}, f)
+        os.replace(temporary_file, cache_file)  # cache file never partially written
+    except (OSError, TypeError, ValueError) as e:  # non-JSON content not expected in the build orders
+        print(f'Could not write the build orders cache {cache_file}: {e}')
+
+
+def read_build_order_file(build_order_file: str, check_valid_build_order, category_name: str = None) -> tuple:
+    """Read and validate a build order file, capturing the printed messages (used by the loading processes)
+
+    Parameters
+    ----------
+    build_order_file           JSON build order file to read
+    check_valid_build_order    function to check if a build order is valid
+    category_name              category name expected in the build order, None if no category
+
+    Returns
+    -------
+    build order data (None if JSON decoding error), only its header for a valid build order
+    True if valid build order (False if not valid or missing category)
+    messages printed by the validation function
+    """
+    with open(build_order_file, 'rb') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError:
+            return None, False, ''
+
+    # validation skipped for invalid content or without category
+    if (not isinstance(data, dict)) or ((category_name is not None) and (category_name not in data)):
+        return data, False, ''
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        valid = check_valid_build_order(data)
+    if valid:  # only the header is kept for valid build orders
+        data = BuildOrderHeader(data, build_order_file)
+    return data, valid, output.getvalue()
+
+
+def add_build_order_data(build_orders: BuildOrderRegistry, build_order_file: str, data,
+                         validate_build_order) -> Optional[BuildOrderHeader]:
+    """Add the data of a build order file to a registry, printing the related messages
+
+    Parameters
+    ----------
+    build_orders            registry where the build order is added
+    build_order_file        JSON build order file which was read
+    data                    content of the file, None if JSON decoding error
+    validate_build_order    function validating the data, only called for a new build order,
+                            returning its header if valid (None otherwise)
+
+    Returns
+    -------
+    header of the build order added, None if not added
+    """
+    category_name = build_orders.category_name
+    if data is None:
+        print(f'JSON decoding error while trying to read {build_order_file}.')
+    elif (category_name is not None) and isinstance(data, dict) and (category_name not in data):  # check category
+        print(f'Category name \'{category_name}\' not in \'{build_order_file}\', skipping it.')
+    elif not build_orders.is_valid_key(data):
+        print(f'Invalid build order name or category in \'{build_order_file}\', skipping it.')
+    elif build_orders.is_new(data):  # new build order to add
+        build_order_header = validate_build_order(data)
+        if (build_order_header is not None) and build_orders.add(build_order_header):
+            return build_order_header
+    else:  # already added this build order (not validated)
+        name = data['name']
+        print(f'Build order \'{name}\' from \'{build_order_file}\' already added, skipping it.')
+    return None
+
+
+def add_read_build_order(build_orders: BuildOrderRegistry, build_order_file: str,
+                         read_result: tuple) -> Optional[BuildOrderHeader]:
+    """Add a build order read by 'read_build_order_file' to a registry, printing the related messages
+
+    Parameters
+    ----------
+    build_orders        registry where the build order is added
+    build_order_file    JSON build order file which was read
+    read_result         output of 'read_build_order_file'
+
+    Returns
+    -------
+    header of the build order added, None if not added
+    """
+    data, valid, output = read_result
+
+    def validate_build_order(build_order: dict) -> Optional[BuildOrderHeader]:
+        """Validation already done while reading: only print its messages (as when reading sequentially)"""
+        print(output, end='')
+        return build_order if valid else None
+
+    return add_build_order_data(build_orders, build_order_file, data, validate_build_order)
+
+
+def get_file_state(file: str) -> Optional[tuple]:
+    """Get the state of a file, to detect modifications
+
+    Parameters
+    ----------
+    file    file to check
+
+    Returns
+    -------
+    (modification time, size) of the file, None if unavailable
+    """
+    try:
+        file_stat = os.stat(file)
+        return file_stat.st_mtime_ns, file_stat.st_size
+    except OSError:
+        return None
+
+
+def get_build_order_files_state(directory: str) -> dict:
+    """Get the state of the build order files, to detect modifications
 
     Parameters
     ----------
-    existing_build_orders    list of existing build orders
-    new_build_order_data     new build order data
-    category_name            if not None, accept build orders with same name, if they are in different categories
+    directory    directory where the JSON build orders are located
 
     Returns
     -------
-    True if new build order to add
+    build order files (in loading order) as {build order file: (modification time, size)}, None if unavailable
+    """
+    return {build_order_file: get_file_state(build_order_file) for build_order_file in
+            list_directory_files(directory, extension='.json')}
+
+
+def load_build_orders(build_orders: BuildOrderRegistry, directory: str, check_valid_build_order,
+                      cache_file: str = None, workers: int = 1, files_state: dict = None):
+    """Load the build orders in a registry, one file after the other (generator)
+
+    Parameters
+    ----------
+    build_orders               registry where the headers of the valid build orders are added
+    directory                  directory where the JSON build orders are located
+    check_valid_build_order    function to check if a build order is valid
+    cache_file                 file storing the valid build orders (only files modified since are read again),
+                               None to read all the files
+    workers                    number of processes reading and validating the files in parallel,
+                               1 to read them in this process
+    files_state                if not None, filled with the state of the files before reading them
+                               (see 'get_build_order_files_state'), to detect the later modifications
+
+    Yields
+    ------
+    number of files processed
+    total number of files
+    header of the build order added to the registry by the last file processed, None if nothing added
     """
-    # check if it is a new build order to add
-    for build_order in existing_build_orders:
-        if build_order['name'] == new_build_order_data['name']:
-            if (category_name is None) or (build_order[category_name] == new_build_order_data[category_name]):
-                return False  # already added
-    return True
+    category_name = build_orders.category_name
+    file_ids = get_build_order_files_state(directory)  # as {build order file: (modification time, size)}
+    if files_state is not None:
+        files_state.update(file_ids)
+    build_order_files = list(file_ids.keys())
+    file_count = len(build_order_files)
+
+    # valid build orders from the previous call, as {build order file: (modification time, size, header)}
+    cache_key = get_build_orders_cache_key(check_valid_build_order, category_name)
+    previous_cache = load_build_orders_cache(cache_file, cache_key) if (cache_file is not None) else dict()
+    new_cache = dict()
+    cache_modified = False  # True if at least one build order was added to the cache
+
+    # files modified since they were cached
+    files_to_read = [build_order_file for build_order_file in build_order_files if (
+            (file_ids[build_order_file] is None) or (build_order_file not in previous_cache) or (
+            previous_cache[build_order_file][:2] != file_ids[build_order_file]))]
+
+    # read and validate the files in parallel, the results being merged below in the files order
+    executor = None
+    read_files = None  # results as (data, valid, printed messages), in the order of 'files_to_read'
+    if (workers > 1) and (len(files_to_read) > 1):
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(files_to_read)))
+        chunk_size = max(1, len(files_to_read) // (4 * workers))
+        read_files = executor.map(read_build_order_file, files_to_read, repeat(check_valid_build_order),
+                                  repeat(category_name), chunksize=chunk_size)
+
+    loading_done = False  # False if the generator is closed before the end (loading stopped)
+    try:
+        for file_id_count, build_order_file in enumerate(build_order_files):
+            added_build_order = None
+
+            # valid build order file not modified since it was cached
+            file_id = file_ids[build_order_file]
+            cached = previous_cache.get(build_order_file)
+            if (file_id is not None) and (cached is not None) and (cached[:2] == file_id):
+                new_cache[build_order_file] = cached
+                added_build_order = add_build_order_data(build_orders, build_order_file, cached[2],
+                                                         lambda build_order_header: build_order_header)  # valid
+
+            # file read in parallel
+            elif read_files is not None:
+                added_build_order = add_read_build_order(build_orders, build_order_file, next(read_files))
+
+            else:  # validation only done for a new build order
+                with open(build_order_file, 'rb') as f:
+                    try:
+                        data = json.load(f)
+                    except json.JSONDecodeError:
+                        data = None
+                added_build_order = add_build_order_data(
+                    build_orders, build_order_file, data,
+                    lambda build_order: (BuildOrderHeader(build_order, build_order_file)
+                                         if check_valid_build_order(build_order) else None))
+
+            # new build order to cache
+            if (added_build_order is not None) and (build_order_file not in new_cache) and (file_id is not None):
+                new_cache[build_order_file] = (*file_id, added_build_order)
+                cache_modified = True
+
+            yield file_id_count + 1, file_count, added_build_order
+        loading_done = True
+    finally:
+        if executor is not None:  # files not read yet cancelled if loading stopped
+            executor.shutdown(wait=loading_done, cancel_futures=not loading_done)
+
+    if (cache_file is not None) and (cache_modified or (len(new_cache) != len(previous_cache))):
+        save_build_orders_cache(cache_file, cache_key, new_cache)
 
 
-def get_build_orders(directory: str, check_valid_build_order, category_name: str = None) -> list:
+def get_build_orders(directory: str, check_valid_build_order, category_name: str = None,
+                     cache_file: str = None, workers: int = 1) -> BuildOrderRegistry:
     """Get the build orders
 
     Parameters
@@ -31,36 +788,60 @@ def get_build_orders(directory: str, check_valid_build_order, category_name: str
     directory                  directory where the JSON build orders are located
     check_valid_build_order    function to check if a build order is valid
     category_name              if not None, accept build orders with same name, if they are in different categories
+    cache_file                 file storing the valid build orders (only files modified since are read again),
+                               None to read all the files
+    workers                    number of processes reading and validating the files in parallel,
+                               1 to read them in this process
 
     Returns
     -------
-    list of valid build orders
+    registry of the valid build orders (headers, see 'BuildOrderHeader')
     """
-    build_order_files = list_directory_files(directory, extension='.json')
+    build_orders = BuildOrderRegistry(category_name)
+    for _ in load_build_orders(build_orders, directory, check_valid_build_order, cache_file, workers):
+        pass
+    return build_orders
 
-    build_orders = []
 
-    for build_order_file in build_order_files:
-        with open(build_order_file, 'rb') as f:
-            try:
-                data = json.load(f)
+def get_build_orders_threading(directory: str, check_valid_build_order, output: list, stop_event: Event,
+                               category_name: str = None, cache_file: str = None, workers: int = 1,
+                               files_state: dict = None) -> Thread:
+    """Get the build orders, using threading
 
-                if (category_name is not None) and (category_name not in data):  # check category
-                    print(f'Category name \'{category_name}\' not in \'{build_order_file}\', skipping it.')
-                    continue
+    Parameters
+    ----------
+    directory                  directory where the JSON build orders are located
+    check_valid_build_order    function to check if a build order is valid
+    output                     output will be added (append) to this list, for each file processed:
+                               (number of files processed, total number of files, valid build order header or None)
+    stop_event                 set it to True to stop the thread
+    category_name              if not None, accept build orders with same name, if they are in different categories
+    cache_file                 file storing the valid build orders (only files modified since are read again),
+                               None to read all the files
+    workers                    number of processes reading and validating the files in parallel,
+                               1 to read them in this thread
+    files_state                if not None, filled with the state of the files before reading them
+                               (see 'load_build_orders')
 
-                # check if it is a new build order to add
-                if is_build_order_new(build_orders, data, category_name):  # new build order to add
-                    if check_valid_build_order(data):
-                        build_orders.append(data)
-                else:  # already added this build order
-                    name = data['name']
-                    print(f'Build order \'{name}\' from \'{build_order_file}\' already added, skipping it.')
+    Returns
+    -------
+    thread ID
+    """
 
-            except json.JSONDecodeError:
-                print(f'JSON decoding error while trying to read {build_order_file}.')
+    def load_build_orders_thread():
+        """Load the build orders (function running in the thread)"""
+        build_orders = BuildOrderRegistry(category_name)  # registry of the thread, to detect duplicates
+        loader = load_build_orders(build_orders, directory, check_valid_build_order, cache_file, workers,
+                                   files_state)
+        for loading_state in loader:
+            if stop_event.is_set():
+                loader.close()  # stop the loading processes without waiting for them
+                return
+            output.append(loading_state)
 
-    return build_orders
+    thread = Thread(target=load_build_orders_thread, daemon=True)
+    thread.start()
+    return thread
 
 
 def is_valid_resource(resource: [int, dict]) -> bool:
@@ -0,0 +1,86 @@
+from thefuzz import process
+from thefuzz.utils import full_process
+
+try:  # C-backed batched scoring (already required by 'thefuzz')
+    from rapidfuzz import process as rapidfuzz_process
+    from rapidfuzz.fuzz import WRatio
+except ImportError:
+    rapidfuzz_process = None
+
+
+def process_fuzzy_choice(choice: str) -> str:
+    """Process a string as 'thefuzz' does before scoring it with its default scorer
+
+    Parameters
+    ----------
+    choice    string to process
+
+    Returns
+    -------
+    lower case string with only ASCII letters, numbers and spaces
+    """
+    return full_process(choice, force_ascii=True)
+
+
+class FuzzyScorer:
+    """Fuzzy search of a query among fixed choices, with the scores and ranking of 'thefuzz.process.extractBests'"""
+
+    def __init__(self, choices, use_batch: bool = True):
+        """Constructor
+
+        Parameters
+        ----------
+        choices      strings to search in
+        use_batch    True to score all the choices in a single C-backed call (if available),
+                     False to use 'thefuzz'
+        """
+        self.choices = list(choices)
+        self.use_batch = use_batch and (rapidfuzz_process is not None)
+
+        # choices processed once, instead of for each search
+        self.processed_choices = [process_fuzzy_choice(choice) for choice in self.choices] if self.use_batch else None
+
+    def extract_ids(self, query: str, score_cutoff: int, limit: int, choice_ids: list = None) -> list:
+        """Get the IDs of the best matching choices
+
+        Parameters
+        ----------
+        query           string to search
+        score_cutoff    minimal score (0-100) of the returned choices
+        limit           maximal number of choices returned
+        choice_ids      IDs (increasing) of the choices to score, None for all of them
+
+        Returns
+        -------
+        IDs of the best matches, best first (first choices kept in case of equality)
+        """
+        if choice_ids is None:
+            choice_ids = range(len(self.choices))
+
+        if not self.use_batch:
+            matches = process.extractBests(query, {x: self.choices[x] for x in choice_ids},
+                                           score_cutoff=score_cutoff, limit=limit)
+            return [match[2] for match in matches]
+
+        # same query processing as 'thefuzz' (once for the query, once for the scorer)
+        processed_query = process_fuzzy_choice(full_process(query))
+        matches = rapidfuzz_process.extract(
+            processed_query, [self.processed_choices[x] for x in choice_ids], scorer=WRatio, processor=None,
+            score_cutoff=score_cutoff, limit=limit)
+        return [choice_ids[match[2]] for match in matches]
+
+    def extract(self, query: str, score_cutoff: int, limit: int, choice_ids: list = None) -> list:
+        """Get the best matching choices
+
+        Parameters
+        ----------
+        query           string to search
+        score_cutoff    minimal score (0-100) of the returned choices
+        limit           maximal number of choices returned
+        choice_ids      IDs (increasing) of the choices to score, None for all of them
+
+        Returns
+        -------
+        best matches, best first
+        """
+        return [self.choices[x] for x in self.extract_ids(query, score_cutoff, limit, choice_ids)]
@@ -1,6 +1,31 @@
 import time
+from collections import deque
 from pynput import keyboard, mouse
 
+# map modifier key names to pynput key objects
+MODIFIER_KEYS = {
+    'ctrl': keyboard.Key.ctrl,
+    'alt': keyboard.Key.alt,
+    'shift': keyboard.Key.shift,
+}
+
+
+def compile_hotkey_sequence(sequence: str) -> frozenset:
+    """Compile a hotkey sequence into the set of keys to press
+
+    Parameters
+    ----------
+    sequence    hotkey sequence (e.g. 'ctrl+h', 'alt+d')
+
+    Returns
+    -------
+    keys of the sequence (pynput key objects for the modifiers, characters otherwise), empty if no sequence
+    """
+    if not sequence:
+        return frozenset()
+    return frozenset(MODIFIER_KEYS.get(key, key) for key in sequence.lower().split('+'))
+
+
 class HotkeyFlagData:
     """Flag for a hotkey, with related data (sequence and timestamp)"""
 
@@ -13,6 +38,7 @@ class HotkeyFlagData:
         sequence    sequence corresponding to the hotkey (keyboard or mouse)
         """
         self.sequence: str = sequence
+        self.keys: frozenset = compile_hotkey_sequence(sequence)  # keys to press for the sequence
         self.flag: bool = False
         self.timestamp: float = 0  # last timestamp when the flag was set to True [s]
         self.set_flag(flag)
@@ -38,18 +64,54 @@ class HotkeyFlagData:
         return time.time() - self.timestamp
 
 
+class InputEvent:
+    """Input event (keyboard hotkey or mouse button), sent from the listener threads"""
+
+    def __init__(self, is_mouse: bool, name: str, pressed_keys: frozenset):
+        """Constructor
+
+        Parameters
+        ----------
+        is_mouse        True for a mouse button, False for a keyboard hotkey
+        name            name of the keyboard hotkey or of the mouse button
+        pressed_keys    keys pressed when the event happened
+        """
+        self.is_mouse: bool = is_mouse
+        self.name: str = name
+        self.pressed_keys: frozenset = pressed_keys
+        self.timestamp: float = time.perf_counter()  # time of the event [s]
+
+    def get_elapsed_time(self) -> float:
+        """Get the elapsed time since the event
+
+        Returns
+        -------
+        Elapsed time [s]
+        """
+        return time.perf_counter() - self.timestamp
+
+
 class KeyboardMouseManagement:
     """Keyboard global hotkeys and mouse global buttons management"""
 
-    def __init__(self, print_unset: bool = True):
+    def __init__(self, print_unset: bool = True, input_callback=None, max_input_events: int = 256):
         """Constructor
 
         Parameters
         ----------
-        print_unset    True to print unset hotkey & button warnings.
+        print_unset         True to print unset hotkey & button warnings.
+        input_callback      function called (from the listener threads) when an input event is queued
+                            (see 'get_input_events'), None to only poll the flags (no input event queued)
+        max_input_events    maximal number of input events waiting to be processed (oldest ones dropped)
         """
         self.print_unset = print_unset
+        self.input_callback = input_callback
+
+        # input events from the listener threads, in order (append and popleft of a deque are thread-safe)
+        self.input_events = deque(maxlen=max_input_events)
+        self.dropped_input_events = 0  # number of input events dropped because not processed in time
         self.keyboard_hotkeys = dict()  # list of keyboard hotkeys available as {name: HotkeyFlagData}
+        self.hotkeys_by_key = dict()  # names of the keyboard hotkeys using each key as {key: [name, ...]}
 
         # For pynput, we need to track currently pressed keys
         self.currently_pressed_keys = set()
@@ -98,12 +160,11 @@ class KeyboardMouseManagement:
         try:
             # Add key to currently pressed set
             if hasattr(key, 'char'):
-                self.currently_pressed_keys.add(key.char)
-            else:
-                self.currently_pressed_keys.add(key)
+                key = key.char
+            self.currently_pressed_keys.add(key)
 
-            # Check all hotkeys for matches
-            self._check_hotkeys()
+            # Check the hotkeys using this key for matches
+            self._check_hotkeys(key)
         except Exception as e:
             print(f"Error in key press handler: {e}")
 
@@ -123,45 +184,67 @@ class KeyboardMouseManagement:
         try:
             if button in self.button_map and not pressed:  # On button release
                 button_name = self.button_map[button]
-                self.set_mouse_flag(button_name, True)
+                if self.input_callback is None:
+                    self.set_mouse_flag(button_name, True)
+                else:
+                    self._add_input_event(InputEvent(
+                        is_mouse=True, name=button_name, pressed_keys=frozenset(self.currently_pressed_keys)))
+                    self.input_callback()
         except Exception as e:
             print(f"Error in mouse click handler: {e}")
 
-    def _check_hotkeys(self):
-        """Check if any registered hotkey combinations are pressed"""
-        for name, hotkey_data in self.keyboard_hotkeys.items():
-            if self._is_hotkey_match(hotkey_data.sequence):
-                self.set_keyboard_hotkey_flags([name], True)
+    def _check_hotkeys(self, pressed_key):
+        """Check if the registered hotkey combinations using a key which was just pressed are pressed
 
-    def _is_hotkey_match(self, sequence):
-        """Check if the current key combination matches the sequence"""
-        if not sequence:
-            return False
+        Parameters
+        ----------
+        pressed_key    key just pressed (character or pynput key object)
+        """
+        hotkey_found = False
+        for name in self.hotkeys_by_key.get(pressed_key, []):
+            if self._is_hotkey_match(self.keyboard_hotkeys[name].keys):
+                if self.input_callback is None:
+                    self.set_keyboard_hotkey_flags([name], True)
+                else:
+                    self._add_input_event(InputEvent(
+                        is_mouse=False, name=name, pressed_keys=frozenset(self.currently_pressed_keys)))
+                    hotkey_found = True
+
+        if hotkey_found:
+            self.input_callback()
+
+    def _add_input_event(self, input_event: InputEvent):
+        """Queue an input event, the oldest one being dropped (and counted) if too many events are waiting
 
-        # Parse the sequence (e.g., 'ctrl+h', 'alt+d')
-        keys = sequence.lower().split('+')
+        Parameters
+        ----------
+        input_event    input event to queue
+        """
+        if len(self.input_events) == self.input_events.maxlen:
+            self.dropped_input_events += 1
+            print(f'Input events not processed in time, oldest one dropped ({self.dropped_input_events} dropped).')
+        self.input_events.append(input_event)
 
-        # Map modifier key names to pynput key objects
-        modifier_map = {
-            'ctrl': keyboard.Key.ctrl,
-            'alt': keyboard.Key.alt,
-            'shift': keyboard.Key.shift,
-        }
+    def _is_hotkey_match(self, keys: frozenset) -> bool:
+        """Check if the current key combination matches the keys of a sequence (see 'compile_hotkey_sequence')"""
+        return (len(keys) > 0) and keys.issubset(self.currently_pressed_keys)
 
-        # Check if all keys in the sequence are pressed
-        for key in keys:
-            if key in modifier_map:
-                if modifier_map[key] not in self.currently_pressed_keys:
-                    return False
-            else:
-                # For regular characters
-                if key not in self.currently_pressed_keys:
-                    return False
+    def get_input_events(self) -> list:
+        """Get the input events received since the last call (each event returned only once)
 
-        return True
+        Returns
+        -------
+        list of InputEvent, oldest first
+        """
+        input_events = []
+        for _ in range(len(self.input_events)):  # events appended meanwhile kept for the next call
+            input_events.append(self.input_events.popleft())
+        return input_events
 
     def set_all_flags(self, value: bool):
-        """Set all the flags (keyboard and mouse) to the same value"""
+        """Set all the flags (keyboard and mouse) to the same value (input events discarded)"""
+        self.input_events.clear()
+
         for key in self.keyboard_hotkeys.keys():
             self.keyboard_hotkeys[key].set_flag(value)
 
@@ -181,6 +264,13 @@ class KeyboardMouseManagement:
 
             # Add/update hotkey in dictionary
             self.keyboard_hotkeys[name] = HotkeyFlagData(sequence=sequence)
+
+            # index replaced at once, as used by the keyboard listener thread
+            hotkeys_by_key = dict()
+            for hotkey_name, hotkey_data in self.keyboard_hotkeys.items():
+                for key in hotkey_data.keys:
+                    hotkeys_by_key.setdefault(key, []).append(hotkey_name)
+            self.hotkeys_by_key = hotkeys_by_key
             return True
 
         except Exception as e:
@@ -198,7 +288,7 @@ class KeyboardMouseManagement:
     def is_keyboard_hotkey_pressed(self, name: str) -> bool:
         """Check if a keyboard hotkey is pressed"""
         if name in self.keyboard_hotkeys:
-            return self._is_hotkey_match(self.keyboard_hotkeys[name].sequence)
+            return self._is_hotkey_match(self.keyboard_hotkeys[name].keys)
         else:
             if self.print_unset:
                 print(f'Unknown keyboard hotkey name received ({name}) to check if it is pressed.')
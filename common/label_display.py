@@ -1,4 +1,6 @@
 import os
+from bisect import bisect_right
+from collections import OrderedDict
 from typing import Union
 
 from PyQt6.QtWidgets import QLabel, QMainWindow
@@ -6,6 +8,8 @@ from PyQt6.QtGui import QPixmap, QFont
 from PyQt6.QtCore import Qt, QTimer
 from typing import Optional
 
+from common.asset_pack import load_asset_pack, get_packed_pixmap
+
 
 def split_multi_label_line(line: str) -> list:
     """Split a line based on the @ markers and remove first/last empty elements
@@ -45,6 +49,141 @@ def is_mouse_in_label(mouse_x: int, mouse_y: int, label: QLabel) -> bool:
             label.y() <= mouse_y <= label.y() + label.height())
 
 
+class PixmapCache:
+    """Size-bounded LRU cache of decoded and scaled pixmaps"""
+
+    def __init__(self, max_count: int = 512):
+        """Constructor
+
+        Parameters
+        ----------
+        max_count    maximal number of pixmaps to keep in the cache
+        """
+        self.max_count = max_count
+        self.pixmaps = OrderedDict()  # pixmaps as {(path, width, height, transform mode): QPixmap}
+
+    def get(self, image_path: str, image_width: int = None, image_height: int = None,
+            transform_mode: Qt.TransformationMode = Qt.TransformationMode.SmoothTransformation) -> Optional[QPixmap]:
+        """Get a scaled pixmap, loading and scaling it only if not already in the cache
+
+        Parameters
+        ----------
+        image_path        path of the image
+        image_width       width to scale the image, None to keep the aspect ratio with the height
+        image_height      height to scale the image, None to keep the aspect ratio with the width
+        transform_mode    transformation mode used to scale the image
+
+        Returns
+        -------
+        requested pixmap, None if neither width nor height is provided
+        """
+        if (image_width is None) and (image_height is None):
+            return None
+
+        key = (image_path, image_width, image_height, transform_mode)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:  # already in the cache
+            self.pixmaps.move_to_end(key)
+            return pixmap
+
+        if image_height is not None:
+            if image_width is not None:  # scale to width and height
+                pixmap = QPixmap(image_path).scaled(image_width, image_height, transformMode=transform_mode)
+            else:  # scale to height, using the pre-scaled picture if available
+                if transform_mode == Qt.TransformationMode.SmoothTransformation:
+                    pixmap = get_packed_pixmap(image_path, image_height)
+                if pixmap is None:
+                    pixmap = QPixmap(image_path).scaledToHeight(image_height, mode=transform_mode)
+        else:  # scale to width
+            pixmap = QPixmap(image_path).scaledToWidth(image_width, mode=transform_mode)
+
+        self.pixmaps[key] = pixmap
+        if len(self.pixmaps) > self.max_count:  # remove the least recently used pixmap
+            self.pixmaps.popitem(last=False)
+        return pixmap
+
+    def clear(self):
+        """Remove all the pixmaps from the cache"""
+        self.pixmaps.clear()
+
+
+# pixmaps shared by all the displays
+pixmap_cache = PixmapCache()
+
+
+class PicturesFolderIndex:
+    """Index of the pictures located in a folder (including its sub-folders)"""
+
+    def __init__(self, folder: str):
+        """Constructor
+
+        Parameters
+        ----------
+        folder    folder where the pictures are located
+        """
+        self.folder = folder
+        self.pictures = dict()  # pictures as {normalized path relative to the folder: full path}
+        self.refresh()
+
+    def refresh(self):
+        """Build the index again from the folder content"""
+        self.pictures.clear()
+        for root, _, files in os.walk(self.folder):
+            for file_name in files:
+                full_path = os.path.join(root, file_name)
+                self.pictures[os.path.normcase(os.path.relpath(full_path, self.folder))] = full_path
+
+    def get(self, image_search: str) -> Union[str, None]:
+        """Get the path for an image of this folder
+
+        Parameters
+        ----------
+        image_search    image to search, relative to the folder
+
+        Returns
+        -------
+        image with its path, None if not found
+        """
+        relative_path = os.path.normcase(os.path.normpath(image_search))
+        if relative_path in self.pictures:
+            return self.pictures[relative_path]
+
+        # absolute paths or paths going out of the folder are not indexed
+        if os.path.isabs(relative_path) or relative_path.startswith(os.pardir):
+            image_path = os.path.join(self.folder, image_search)
+            if os.path.isfile(image_path):
+                return image_path
+
+        # not found
+        return None
+
+
+# pictures folders indexes as {folder: PicturesFolderIndex}, shared by all the displays
+pictures_folder_indexes = dict()
+
+
+def get_pictures_folder_index(folder: str) -> PicturesFolderIndex:
+    """Get the index of a pictures folder, building it on the first call
+
+    Parameters
+    ----------
+    folder    folder where the pictures are located
+
+    Returns
+    -------
+    index of the pictures folder
+    """
+    if folder not in pictures_folder_indexes:
+        pictures_folder_indexes[folder] = PicturesFolderIndex(folder)
+    return pictures_folder_indexes[folder]
+
+
+def refresh_pictures_folder_indexes():
+    """Refresh all the pictures folders indexes (e.g. after pictures were added)"""
+    for pictures_folder_index in pictures_folder_indexes.values():
+        pictures_folder_index.refresh()
+
+
 class QLabelSettings:
     """Settings for a QLabel"""
 
@@ -71,6 +210,55 @@ class QLabelSettings:
         if (text_alignment != 'left') and (text_alignment != 'center') and (text_alignment != 'right'):
             self.text_alignment = None
 
+    def compile(self, color_default: list) -> (str, Optional[Qt.AlignmentFlag]):
+        """Get the stylesheet and alignment corresponding to these settings
+
+        Parameters
+        ----------
+        color_default    default text RGB color, used if no text color is specified
+
+        Returns
+        -------
+        stylesheet string (color, background color, boldness)
+        alignment flag, None to keep the current alignment
+        """
+        text_color = color_default if (self.text_color is None) else self.text_color
+        key = (tuple(text_color), self.text_bold, self.text_alignment,
+               None if (self.background_color is None) else tuple(self.background_color))
+
+        compiled = compiled_qlabel_settings.get(key)
+        if compiled is not None:
+            return compiled
+
+        # font text color
+        style_str = f'color: rgb({text_color[0]}, {text_color[1]}, {text_color[2]})'
+
+        # background color
+        if self.background_color is not None:
+            background_color = self.background_color
+            style_str += f';background-color: rgb({background_color[0]}, {background_color[1]}, {background_color[2]})'
+
+        if self.text_bold:  # bold font
+            style_str += ';font-weight: bold'
+
+        # text alignment
+        alignment = None
+        if self.text_alignment == 'left':
+            alignment = Qt.AlignmentFlag.AlignLeft
+        elif self.text_alignment == 'center':
+            alignment = Qt.AlignmentFlag.AlignCenter
+        elif self.text_alignment == 'right':
+            alignment = Qt.AlignmentFlag.AlignRight
+
+        if len(compiled_qlabel_settings) >= 1024:  # limited number of styles expected, safety bound
+            compiled_qlabel_settings.clear()
+        compiled_qlabel_settings[key] = (style_str, alignment)
+        return style_str, alignment
+
+
+# compiled settings, as {(text color, bold, alignment, background color): (stylesheet, alignment flag)}
+compiled_qlabel_settings = dict()
+
 
 class MultiQLabelDisplay:
     """Display of several QLabel items"""
@@ -114,12 +302,35 @@ class MultiQLabelDisplay:
         if (self.game_pictures_folder is not None) or (self.common_pictures_folder is not None):
             assert self.image_height > 0  # valid height must be provided
 
+        # indexes of the pictures folders
+        self.game_pictures_index = get_pictures_folder_index(self.game_pictures_folder) if (
+                self.game_pictures_folder is not None) else None
+
+        self.common_pictures_index = get_pictures_folder_index(self.common_pictures_folder) if (
+                self.common_pictures_folder is not None) else None
+
+        # pre-scaled pictures (optional)
+        for pictures_folder in [self.game_pictures_folder, self.common_pictures_folder]:
+            if pictures_folder is not None:
+                load_asset_pack(pictures_folder)
+
         self.labels = []  # labels to display
+        self.label_pool = []  # hidden labels, available to be reused
         self.shown = False  # True if labels currently shown
 
         self.row_max_width = 0  # maximal width of a row
         self.row_total_height = 0  # cumulative height of all the rows (with vertical spacing)
 
+        # last layout (see 'update_size_position')
+        self.dirty_rows = set()  # IDs of the rows changed since the last layout
+        self.label_sizes = []  # size of each label after adjusting it, as [[(width, height), ...], ...]
+        self.layout_parameters = None  # parameters of the last layout, None if no layout done
+        self.column_width = None  # width of each column for the last layout, None if not adapted to columns
+        self.row_y = []  # Y position of each row
+        self.row_heights = []  # height of each row
+        self.row_x = []  # X position where each label starts for each row, followed by the end of the last label
+        self.last_mouse_label_id = None  # last hit test as (mouse X, mouse Y, [row ID, column ID]), None if none
+
         self.row_tooltips: dict = dict()  # content of the available tooltips for each row of the MultiQLabelDisplay
 
     def update_settings(self, font_police: str, font_size: int, border_size: int,
@@ -137,6 +348,10 @@ class MultiQLabelDisplay:
         """
         self.clear()  # clear current content
 
+        # scaled pixmaps are not valid anymore
+        if image_height != self.image_height:
+            pixmap_cache.clear()
+
         # font and images
         self.font_police = font_police
         self.font_size = font_size
@@ -212,48 +427,69 @@ class MultiQLabelDisplay:
         return False
 
     def clear(self):
-        """Hide and remove all labels"""
+        """Hide and remove all labels (kept in the pool to be reused)"""
         for row in self.labels:
             for label in row:
-                label.deleteLater()
+                label.hide()
+                self.label_pool.append(label)
             row.clear()
         self.labels.clear()
         self.hide()
 
-    def set_qlabel_settings(self, label: QLabel, settings: QLabelSettings = None):
+        self.dirty_rows.clear()
+        self.label_sizes.clear()
+        self.layout_parameters = None
+        self.row_x.clear()
+        self.last_mouse_label_id = None
+
+    def get_label(self, parent) -> QLabel:
+        """Get an empty label, reusing one from the pool when available
+
+        Parameters
+        ----------
+        parent    parent element of the label
+
+        Returns
+        -------
+        label with no text, no pixmap and default alignment
+        """
+        if len(self.label_pool) == 0:  # no label to reuse
+            return QLabel('', parent)
+
+        label = self.label_pool.pop()
+        if label.parent() is not parent:
+            label.setParent(parent)
+        label.clear()  # remove text and pixmap
+        label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+        return label
+
+    def set_qlabel_settings(self, label: QLabel, settings: QLabelSettings = None) -> bool:
         """Adapt the settings (color, boldness...) of a QLabel
 
         Parameters
         ----------
         label       QLabel to update
         settings    settings of the QLabel, None for default
+
+        Returns
+        -------
+        True if the style or alignment of the QLabel changed
         """
         if settings is None:  # use default settings
             settings = QLabelSettings()
 
-        # font text color
-        text_color = self.color_default if (settings.text_color is None) else settings.text_color
-        style_str = f'color: rgb({text_color[0]}, {text_color[1]}, {text_color[2]})'
+        style_str, alignment = settings.compile(self.color_default)
+        changed = False
 
-        # background color
-        if settings.background_color is not None:
-            background_color = settings.background_color
-            style_str += f';background-color: rgb({background_color[0]}, {background_color[1]}, {background_color[2]})'
+        if label.styleSheet() != style_str:  # avoid parsing the same stylesheet again
+            label.setStyleSheet(style_str)
+            changed = True
 
-        if settings.text_bold:  # bold font
-            style_str += ';font-weight: bold'
+        if (alignment is not None) and (label.alignment() != alignment):
+            label.setAlignment(alignment)
+            changed = True
 
-        label.setStyleSheet(style_str)
-
-        # text alignment
-        text_alignment = settings.text_alignment
-        if text_alignment is not None:
-            if text_alignment == 'left':
-                label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            elif text_alignment == 'center':
-                label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            elif text_alignment == 'right':
-                label.setAlignment(Qt.AlignmentFlag.AlignRight)
+        return changed
 
     def get_image_path(self, image_search: str) -> Union[str, None]:
         """Get the path for an image
@@ -266,104 +502,119 @@ class MultiQLabelDisplay:
         -------
         image with its path, None if not found
         """
-        if self.game_pictures_folder is not None:  # try first with the game folder
-            game_image_path = os.path.join(self.game_pictures_folder, image_search)
-            if os.path.isfile(game_image_path):
+        if self.game_pictures_index is not None:  # try first with the game folder
+            game_image_path = self.game_pictures_index.get(image_search)
+            if game_image_path is not None:
                 return game_image_path
 
         # try then with the common folder
-        if self.common_pictures_folder is not None:
-            common_image_path = os.path.join(self.common_pictures_folder, image_search)
-            if os.path.isfile(common_image_path):
+        if self.common_pictures_index is not None:
+            common_image_path = self.common_pictures_index.get(image_search)
+            if common_image_path is not None:
                 return common_image_path
 
         # not found
         return None
 
-    def add_row_from_picture_line(self, parent, line: str, labels_settings: list = None,
-                                  tooltips: Optional[dict] = None):
-        """Add a row of labels based on a line mixing text and images.
+    def prepare_picture_line(self, line: str, labels_settings: list = None) -> list:
+        """Split a line mixing text and images and resolve its image paths, to later add it as a row
 
         Parameters
         ----------
-        parent             parent element of this object
         line               string text line with images between @ markers (e.g. 'text @image@ text')
         labels_settings    settings for the QLabel elements, must be the same size as the line after splitting,
                            see 'split_multi_label_line' function (None for default settings).
-        tooltips           optional dictionary mapping a piece of the line to a tooltip
+
+        Returns
+        -------
+        list of (text, image path or None for text, settings or None) for each label, empty if nothing to display
         """
         if len(line) == 0:
-            return
+            return []
 
         if (self.game_pictures_folder is None) and (self.common_pictures_folder is None):  # no picture
-            label = QLabel('', parent)
-            label.setFont(QFont(self.font_police, self.font_size))
-            label.setText(line)
-            if labels_settings is not None:
-                if len(labels_settings) == 1:
-                    self.set_qlabel_settings(label, labels_settings[0])
-                else:
-                    print(f'Wrong size for \'labels_settings\' ({len(labels_settings)} vs 1).')
-                    self.set_qlabel_settings(label)
-            else:
-                self.set_qlabel_settings(label)
-            self.labels.append([label])
+            if (labels_settings is not None) and (len(labels_settings) != 1):
+                print(f'Wrong size for \'labels_settings\' ({len(labels_settings)} vs 1).')
+                labels_settings = None
+            return [(line, None, labels_settings[0] if (labels_settings is not None) else None)]
 
         else:  # pictures available
             split_line = split_multi_label_line(line)
             split_count = len(split_line)
 
-            if split_count > 0:
-                # check labels_settings items count
-                if labels_settings is not None:
-                    if len(labels_settings) != split_count:
-                        print(f'Wrong size for \'labels_settings\' ({len(labels_settings)} vs {split_count}).')
-                        labels_settings = None
-
-                row = []
-                for split_id in range(split_count):  # loop on the line parts
-                    label = QLabel('', parent)
-                    label.setObjectName(split_line[split_id])
-
-                    # get image path
-                    image_path = self.get_image_path(split_line[split_id])
-
-                    if image_path is not None:  # image found
-
-                        # resize the image according to the settings
-                        image_width = None
-                        image_height = self.image_height  # scaled to height by default
-                        if labels_settings is not None and labels_settings[split_id] is not None:
-                            if labels_settings[split_id].image_width is not None:
-                                image_width = labels_settings[split_id].image_width
-                            if labels_settings[split_id].image_height is not None:
-                                image_height = labels_settings[split_id].image_height
-
-                        if image_height is not None:
-                            if image_width is not None:  # scale to width and height
-                                label.setPixmap(QPixmap(image_path).scaled(image_width, image_height,
-                                                                           transformMode=Qt.TransformationMode.SmoothTransformation))
-                            else:  # scale to height
-                                label.setPixmap(
-                                    QPixmap(image_path).scaledToHeight(image_height, mode=Qt.TransformationMode.SmoothTransformation))
-                        elif image_width is not None:  # scale to width
-                            label.setPixmap(
-                                QPixmap(image_path).scaledToWidth(image_width, mode=Qt.TransformationMode.SmoothTransformation))
-                    else:  # image not found
-                        label.setText(split_line[split_id])
-                        label.setFont(QFont(self.font_police, self.font_size))
-
-                    if labels_settings is not None:
-                        self.set_qlabel_settings(label, labels_settings[split_id])
-                    else:
-                        self.set_qlabel_settings(label)
-                    row.append(label)
-
-                self.row_tooltips[len(self.labels)] = tooltips
-                self.labels.append(row)
+            # check labels_settings items count
+            if (split_count > 0) and (labels_settings is not None):
+                if len(labels_settings) != split_count:
+                    print(f'Wrong size for \'labels_settings\' ({len(labels_settings)} vs {split_count}).')
+                    labels_settings = None
+
+            return [(split_line[split_id], self.get_image_path(split_line[split_id]),
+                     labels_settings[split_id] if (labels_settings is not None) else None)
+                    for split_id in range(split_count)]
+
+    def add_row_from_prepared_line(self, parent, prepared_line: list, tooltips: Optional[dict] = None):
+        """Add a row of labels based on a line obtained with 'prepare_picture_line'
+
+        Parameters
+        ----------
+        parent           parent element of this object
+        prepared_line    line obtained with 'prepare_picture_line'
+        tooltips         optional dictionary mapping a piece of the line to a tooltip
+        """
+        if len(prepared_line) == 0:
+            return
+
+        pictures_available = (self.game_pictures_folder is not None) or (self.common_pictures_folder is not None)
+
+        row = []
+        for text, image_path, settings in prepared_line:  # loop on the line parts
+            label = self.get_label(parent)
+            if pictures_available:
+                label.setObjectName(text)
+
+            if image_path is not None:  # image found
+
+                # resize the image according to the settings
+                image_width = None
+                image_height = self.image_height  # scaled to height by default
+                if settings is not None:
+                    if settings.image_width is not None:
+                        image_width = settings.image_width
+                    if settings.image_height is not None:
+                        image_height = settings.image_height
+
+                pixmap = pixmap_cache.get(image_path, image_width, image_height)
+                if pixmap is not None:
+                    label.setPixmap(pixmap)
+            else:  # text (or image not found)
+                label.setText(text)
+                label.setFont(QFont(self.font_police, self.font_size))
+
+            self.set_qlabel_settings(label, settings)
+            row.append(label)
+
+        if pictures_available:
+            self.row_tooltips[len(self.labels)] = tooltips
+        self.dirty_rows.add(len(self.labels))
+        self.label_sizes.append([])
+        self.labels.append(row)
+
+    def add_row_from_picture_line(self, parent, line: str, labels_settings: list = None,
+                                  tooltips: Optional[dict] = None):
+        """Add a row of labels based on a line mixing text and images.
+
+        Parameters
+        ----------
+        parent             parent element of this object
+        line               string text line with images between @ markers (e.g. 'text @image@ text')
+        labels_settings    settings for the QLabel elements, must be the same size as the line after splitting,
+                           see 'split_multi_label_line' function (None for default settings).
+        tooltips           optional dictionary mapping a piece of the line to a tooltip
+        """
+        self.add_row_from_prepared_line(parent, self.prepare_picture_line(line, labels_settings), tooltips)
 
     def update_size_position(self, init_x: int = -1, init_y: int = -1, adapt_to_columns: bool = False):
-        """Update the size and position of all the labels
+        """Update the size and position of the labels (only re-measuring the rows which changed)
 
         Parameters
         ----------
@@ -371,65 +622,110 @@ class MultiQLabelDisplay:
         init_y              initial Y position of the first label, negative for border size
         adapt_to_columns    adapt the width to have columns in case each row has the same number of elements
         """
+        # starting position
+        init_x = init_x if (init_x >= 0) else self.border_size
+        init_y = init_y if (init_y >= 0) else self.border_size
 
-        # adjust the size of the items
-        for row in self.labels:
-            for label in row:
+        layout_parameters = (init_x, init_y, adapt_to_columns, self.vertical_spacing)
+        if (layout_parameters == self.layout_parameters) and (len(self.dirty_rows) == 0):
+            return  # nothing changed since the last layout
+
+        # adjust the size of the items which changed
+        resized_rows = False  # True if at least one row changed its size
+        for row_id in self.dirty_rows:
+            row_sizes = []
+            for label in self.labels[row_id]:
                 label.adjustSize()
+                row_sizes.append((label.width(), label.height()))
+            resized_rows = resized_rows or (row_sizes != self.label_sizes[row_id])
+            self.label_sizes[row_id] = row_sizes
 
         # adjust width to have columns
+        column_width = None  # maximum width for each column, None if not adapting to columns
         if adapt_to_columns and (len(self.labels) >= 2):  # at least two rows needed
             column_count = len(self.labels[0])  # number of expected columns
-            column_width = [0] * column_count  # store the maximum width for each column
-            valid_column_count = True  # assuming valid number of columns for each row
-            for row in self.labels:  # loop on the rows
-                if len(row) != column_count:
-                    print(f'Non-consistent column counts: {column_count} vs {len(row)}.')
-                    valid_column_count = False
+            column_width = [0] * column_count
+            for row_sizes in self.label_sizes:  # loop on the rows
+                if len(row_sizes) != column_count:
+                    print(f'Non-consistent column counts: {column_count} vs {len(row_sizes)}.')
+                    column_width = None
                     break
-                for column_id, label in enumerate(row):  # loop on the columns
-                    column_width[column_id] = max(column_width[column_id], label.width())
+                for column_id, (label_width, _) in enumerate(row_sizes):  # loop on the columns
+                    column_width[column_id] = max(column_width[column_id], label_width)
 
-            if valid_column_count:  # columns count were consistent
-                for row in self.labels:
-                    for column_id, label in enumerate(row):
-                        label.resize(column_width[column_id], label.height())
+        # rows to place: only the ones which changed, unless the other rows are moving too
+        if resized_rows or (layout_parameters != self.layout_parameters) or (column_width != self.column_width):
+            placed_rows = range(len(self.labels))
+        else:
+            placed_rows = sorted(self.dirty_rows)
 
-        # starting position
-        init_x = init_x if (init_x >= 0) else self.border_size
-        init_y = init_y if (init_y >= 0) else self.border_size
+        self.layout_parameters = layout_parameters
+        self.column_width = column_width
+        self.dirty_rows.clear()
+        self.last_mouse_label_id = None
 
-        # reset width and height measures
+        # Y position and height of each row
+        row_count = len(self.labels)
+        self.row_y = [0] * row_count
+        self.row_heights = [max(label_height for _, label_height in row_sizes) for row_sizes in self.label_sizes]
+        label_y = init_y  # current Y position
+        for row_id in range(row_count):
+            self.row_y[row_id] = label_y
+            label_y += self.row_heights[row_id] + self.vertical_spacing
+
+        # update maximal width and total height
         self.row_max_width = 0
-        self.row_total_height = 0
+        for row_sizes in self.label_sizes:
+            if column_width is not None:
+                self.row_max_width = max(self.row_max_width, sum(column_width))
+            else:
+                self.row_max_width = max(self.row_max_width, sum(label_width for label_width, _ in row_sizes))
+        self.row_total_height = sum(self.row_heights) + max(0, row_count - 1) * self.vertical_spacing
 
-        label_y = init_y  # current Y position
+        # X positions, resized if rows were added
+        del self.row_x[row_count:]
+        self.row_x.extend([] for _ in range(row_count - len(self.row_x)))
 
-        row_count = len(self.labels)
-        for row_id, row in enumerate(self.labels):  # loop on all the rows
-            total_width = 0
-            max_height = 0
+        for row_id in placed_rows:  # loop on the rows to place
+            max_height = self.row_heights[row_id]
             label_x = init_x  # current X position
+            self.row_x[row_id] = [label_x]
 
-            for label in row:  # loop on all the labels of the row
-                label.move(label_x, label_y)
-                label_x += label.width()
-                total_width += label.width()
-                max_height = max(max_height, label.height())
+            for column_id, label in enumerate(self.labels[row_id]):  # loop on all the labels of the row
+                label_width, label_height = self.label_sizes[row_id][column_id]
+                if column_width is not None:
+                    label_width = column_width[column_id]
+                    label.resize(label_width, label_height)
 
-            # adapt to center along the max height
-            for label in row:
-                cur_height = label.height()
-                if cur_height < max_height:
-                    diff_height = max_height - cur_height
-                    label.move(label.x(), label.y() + diff_height // 2)
-
-            # update maximal width and total height
-            self.row_max_width = max(self.row_max_width, total_width)
-            self.row_total_height += max_height
-            if row_id < row_count - 1:  # not the last row
-                self.row_total_height += self.vertical_spacing
-                label_y += max_height + self.vertical_spacing
+                # adapt to center along the max height
+                label.move(label_x, self.row_y[row_id] + (max_height - label_height) // 2)
+                label_x += label_width
+                self.row_x[row_id].append(label_x)
+
+    def is_hit_index_valid(self) -> bool:
+        """Check if the positions of the last layout still match the labels
+
+        Returns
+        -------
+        True if the row and column positions can be used to find the labels
+        """
+        return len(self.row_x) == len(self.labels) == len(self.row_y)
+
+    def get_hit_columns(self, row_id: int, mouse_x: int) -> list:
+        """Get the IDs of the columns of a row which may contain a mouse X position
+
+        Parameters
+        ----------
+        row_id     ID of the row
+        mouse_x    mouse X position (inside the window)
+
+        Returns
+        -------
+        list of column IDs to check (at most two, as labels share their borders)
+        """
+        row_x = self.row_x[row_id]
+        column_id = bisect_right(row_x, mouse_x) - 1  # last column starting before the mouse
+        return [x for x in (column_id - 1, column_id) if 0 <= x < len(self.labels[row_id])]
 
     def get_mouse_label_id(self, mouse_x: int, mouse_y: int) -> list:
         """Get the IDs of the label hovered by the mouse
@@ -443,11 +739,29 @@ class MultiQLabelDisplay:
         -------
         [row ID, column ID] of the label, [-1, -1] if not hovering any label
         """
-        for row_id, row in enumerate(self.labels):
-            for column_id, label in enumerate(row):
-                if is_mouse_in_label(mouse_x, mouse_y, label):
-                    return [row_id, column_id]
-        return [-1, -1]
+        if not self.is_hit_index_valid():  # rows added since the last layout
+            for row_id, row in enumerate(self.labels):
+                for column_id, label in enumerate(row):
+                    if is_mouse_in_label(mouse_x, mouse_y, label):
+                        return [row_id, column_id]
+            return [-1, -1]
+
+        # mouse did not move since the last call
+        if (self.last_mouse_label_id is not None) and (self.last_mouse_label_id[:2] == (mouse_x, mouse_y)):
+            return list(self.last_mouse_label_id[2])
+
+        result = [-1, -1]
+        row_id = bisect_right(self.row_y, mouse_y) - 1  # last row starting before the mouse
+        for row_candidate in (row_id - 1, row_id):  # previous row checked first, in case of shared border
+            if (row_candidate < 0) or (result[0] >= 0):
+                continue
+            for column_id in self.get_hit_columns(row_candidate, mouse_x):
+                if is_mouse_in_label(mouse_x, mouse_y, self.labels[row_candidate][column_id]):
+                    result = [row_candidate, column_id]
+                    break
+
+        self.last_mouse_label_id = (mouse_x, mouse_y, result)
+        return list(result)
 
     def set_color_label(self, row_id: int, column_id: int, color: list = None):
         """Set the color of a label element
@@ -466,7 +780,8 @@ class MultiQLabelDisplay:
         if 0 <= row_id < len(self.labels):
             row = self.labels[row_id]
             if 0 <= column_id < len(row):
-                self.set_qlabel_settings(row[column_id], settings=QLabelSettings(text_color=color))
+                if self.set_qlabel_settings(row[column_id], settings=QLabelSettings(text_color=color)):
+                    self.dirty_rows.add(row_id)  # size to measure again only if the style changed
             else:
                 print(f'Wrong column ID to set the color: {column_id}.')
         else:
@@ -489,13 +804,19 @@ class MultiQLabelDisplay:
         """
 
         # skip if there is no valid tooltip for this row
-        if (len(self.row_tooltips) <= row) or (len(self.row_tooltips[row]) == 0):
+        row_tooltips = self.row_tooltips.get(row)
+        if (not row_tooltips) or not (0 <= row < len(self.labels)):
             return None, -1, -1
 
-        # loop on the labels of the requested row
-        for label in self.labels[row]:
-            if (label.objectName() in self.row_tooltips[row].keys()) and is_mouse_in_label(mouse_x, mouse_y, label):
-                return self.row_tooltips[row][label.objectName()], label.x(), label.y()
+        # labels of the requested row which may be hovered
+        if self.is_hit_index_valid():
+            labels = [self.labels[row][column_id] for column_id in self.get_hit_columns(row, mouse_x)]
+        else:
+            labels = self.labels[row]
+
+        for label in labels:
+            if (label.objectName() in row_tooltips) and is_mouse_in_label(mouse_x, mouse_y, label):
+                return row_tooltips[label.objectName()], label.x(), label.y()
         return None, -1, -1
 
 
@@ -0,0 +1,92 @@
+import time
+from collections import deque
+
+
+class LatencyProbe:
+    """Timestamps of the stages between an input and its display, with rolling percentiles (debug tool)"""
+
+    def __init__(self, stages: list, enabled: bool = False, window_size: int = 200, print_count: int = 20):
+        """Constructor
+
+        Parameters
+        ----------
+        stages         names of the stages after the input, in order, the last one ending the measure
+                       (only once the previous one was reached)
+        enabled        True to measure the latencies, False to skip it (no cost)
+        window_size    number of the last measures used to compute the percentiles
+        print_count    number of measures between two prints of the percentiles
+        """
+        self.stages = stages
+        self.enabled = enabled
+        self.print_count = print_count
+        self.start_time = None  # time of the pending input [s], None if no pending input
+        self.stage_times = dict()  # times of the stages reached by the pending input as {stage: time [s]}
+        self.latencies = {stage: deque(maxlen=window_size) for stage in stages}  # as {stage: [latency [s], ...]}
+        self.measure_count = 0  # number of complete measures
+
+    def start(self, start_time: float = None):
+        """Input received, starting a new measure (the pending one being dropped)
+
+        Parameters
+        ----------
+        start_time    time of the input ('time.perf_counter') [s], None for now
+        """
+        if self.enabled:
+            self.stage_times = dict()
+            self.start_time = time.perf_counter() if (start_time is None) else start_time
+
+    def mark(self, stage: str):
+        """Stage reached by the pending input (only the first time)
+
+        Parameters
+        ----------
+        stage    name of the stage
+        """
+        if self.enabled and (self.start_time is not None) and (stage not in self.stage_times):
+            if stage == self.stages[-1]:  # last stage: measure complete
+                if (len(self.stages) == 1) or (self.stages[-2] in self.stage_times):
+                    self.stage_times[stage] = time.perf_counter()
+                    self.end()
+            else:
+                self.stage_times[stage] = time.perf_counter()
+
+    def end(self):
+        """Store the measure of the pending input, printing the percentiles regularly"""
+        for stage, stage_time in self.stage_times.items():
+            self.latencies[stage].append(stage_time - self.start_time)
+        self.start_time = None
+        self.measure_count += 1
+        if self.measure_count % self.print_count == 0:
+            print(self.get_summary())
+
+    @staticmethod
+    def get_percentile(sorted_values: list, percentile: float) -> float:
+        """Get a percentile of values
+
+        Parameters
+        ----------
+        sorted_values    values sorted in increasing order (not empty)
+        percentile       requested percentile (0-100)
+
+        Returns
+        -------
+        percentile of the values (nearest rank)
+        """
+        rank = max(0, min(len(sorted_values) - 1, int(round(percentile / 100.0 * len(sorted_values))) - 1))
+        return sorted_values[rank]
+
+    def get_summary(self) -> str:
+        """Get the percentiles of the latency of each stage since the input
+
+        Returns
+        -------
+        line with the percentiles of each stage [ms]
+        """
+        summary = f'Input latency [ms] ({self.measure_count} inputs)'
+        for stage in self.stages:
+            values = sorted(self.latencies[stage])
+            if len(values) > 0:
+                summary += f' | {stage}: ' + ', '.join(
+                    f'p{percentile} {1000.0 * self.get_percentile(values, percentile):.1f}' for percentile in
+                    [50, 90, 99])
+        return summary
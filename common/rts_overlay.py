@@ -4,19 +4,23 @@ import appdirs
 import webbrowser
 import subprocess
 from copy import deepcopy
-from thefuzz import process
 from typing import Optional
+from threading import Event
 
 from PyQt6.QtWidgets import QMainWindow, QApplication, QLabel, QLineEdit, QPushButton
 from PyQt6.QtWidgets import QWidget, QComboBox, QTextEdit, QCheckBox
 from PyQt6.QtGui import QKeySequence, QFont, QIcon, QCursor, QPixmap, QShortcut
-from PyQt6.QtCore import Qt, QPoint, QSize, QCoreApplication
+from PyQt6.QtCore import Qt, QPoint, QSize, QCoreApplication, QTimer, QFileSystemWatcher, pyqtSignal
 
-from common.build_order_tools import get_build_orders, check_build_order_key_values, is_build_order_new
-from common.label_display import MultiQLabelDisplay, QLabelSettings, MultiQLabelWindow
+from common.build_order_tools import get_build_orders_threading, BuildOrderRegistry, BuildOrderHeader, \
+    BuildOrderSearchIndex, get_file_state, get_build_order_files_state, read_build_order_file, add_read_build_order
+from common.label_display import MultiQLabelDisplay, QLabelSettings, MultiQLabelWindow, \
+    refresh_pictures_folder_indexes
 from common.useful_tools import TwinHoverButton, scale_int, scale_list_int, set_background_opacity, \
     OverlaySequenceEdit, widget_x_end, widget_y_end, popup_message, Checkbox
-from common.keyboard_mouse import KeyboardMouseManagement
+from common.keyboard_mouse import KeyboardMouseManagement, InputEvent
+from common.timer_scheduler import TimerScheduler
+from common.latency_probe import LatencyProbe
 from common.rts_settings import RTSHotkeys, KeyboardMouse
 
 from aoe2.counters_search import CountersSearchWindow
@@ -280,9 +284,31 @@ class BuildOrderWindow(QMainWindow):
         super().close()
 
 
+class BuildOrderStepDisplay:
+    """Display content of a build order step, prepared once when selecting the build order"""
+
+    def __init__(self, step_text: str, resources_line: list, resources_tooltips: Optional[dict], notes_lines: list):
+        """Constructor
+
+        Parameters
+        ----------
+        step_text             text with the step number
+        resources_line        resources line, prepared with 'MultiQLabelDisplay.prepare_picture_line'
+        resources_tooltips    tooltips for the resources line, None if no tooltip
+        notes_lines           notes lines, each of them prepared with 'MultiQLabelDisplay.prepare_picture_line'
+        """
+        self.step_text = step_text
+        self.resources_line = resources_line
+        self.resources_tooltips = resources_tooltips
+        self.notes_lines = notes_lines
+
+
 class RTSGameOverlay(QMainWindow):
     """RTS game overlay application"""
 
+    # emitted from the keyboard and mouse listener threads, queued to be processed in the main thread
+    hotkey_input_signal = pyqtSignal()
+
     def __init__(self, directory_main: str, name_game: str, settings_name: str, settings_class,
                  check_valid_build_order, build_order_category_name: str = None):
         """Constructor
@@ -312,6 +338,7 @@ class RTSGameOverlay(QMainWindow):
         self.directory_settings = os.path.join(self.directory_config_game, 'settings')  # settings file
         self.directory_build_orders = os.path.join(self.directory_main, 'build_orders', "aoe2")  # build orders
         self.directory_audio = os.path.join(self.directory_main, 'audio')
+        self.build_orders_cache_file = os.path.join(self.directory_config_game, 'cache', 'build_orders.json')
 
         # settings
         self.unscaled_settings = settings_class()
@@ -377,6 +404,9 @@ class RTSGameOverlay(QMainWindow):
         self.mouse_x = 0
         self.mouse_y = 0
 
+        # timers of the application, added by the main script
+        self.timer_scheduler = TimerScheduler()
+
         self.stop_application = False  # True if application must be stopped
 
         # build order selection
@@ -385,12 +415,30 @@ class RTSGameOverlay(QMainWindow):
         self.build_order_selection_id = 0  # ID selection of the build order in list
         self.selected_build_order = None  # selected build order
         self.selected_build_order_name = None  # selected build order name
+        self.selected_build_order_file = None  # file of the selected build order
         self.selected_build_order_step_count = 0  # selected build order count of steps
         self.selected_build_order_step_id = -1  # selected build order step ID
+        self.build_order_steps_display = []  # display of each step of the selected build order
         self.check_valid_build_order = check_valid_build_order
         self.build_order_category_name = build_order_category_name
-        self.build_orders = get_build_orders(self.directory_build_orders, check_valid_build_order,
-                                             category_name=self.build_order_category_name)
+        self.build_orders = BuildOrderRegistry(build_order_category_name)  # valid build orders (loaded in thread)
+        self.build_orders_search_index = None  # index of the build orders for the fuzzy search
+        self.store_build_orders = []  # used for build orders loading in parallel thread
+        self.loaded_build_order_files_state = dict()  # state of the files read by the thread (see 'files_state')
+        self.build_orders_stop_flag = Event()
+        self.build_orders_thread_id = None
+
+        # watch the build order files once loaded, to update the build orders modified while running
+        self.build_order_files_state = dict()  # as {build order file: (modification time, size)}
+        self.build_order_file_headers = dict()  # headers of the loaded build orders as {build order file: header}
+        self.build_orders_watcher = QFileSystemWatcher(self)
+        self.build_orders_watcher.directoryChanged.connect(self.build_order_files_changed)
+        self.build_orders_watcher.fileChanged.connect(self.build_order_files_changed)
+        self.build_orders_watcher_timer = QTimer(self)  # to process several changes at once
+        self.build_orders_watcher_timer.setSingleShot(True)
+        self.build_orders_watcher_timer.timeout.connect(self.update_build_order_files)
+
+        self.load_build_orders()
 
         # selected username
         self.selected_username = self.settings.username if (len(self.settings.username) > 0) else None
@@ -406,7 +454,11 @@ class RTSGameOverlay(QMainWindow):
         layout = self.settings.layout
         self.build_order_title = QLabel('Build order', self)
         self.build_order_search = QLineEdit(self)
-        self.build_order_search.textChanged.connect(self.update_build_order_display)
+        self.build_order_search.textChanged.connect(self.build_order_search_changed)
+        self.build_order_search_timer = QTimer(self)  # to run a single search for several typed characters
+        self.build_order_search_timer.setSingleShot(True)
+        self.build_order_search_timer.timeout.connect(self.run_build_order_search)
+        self.build_order_searched_text = None  # search bar text used for the last search
         self.build_order_selection = MultiQLabelDisplay(
             font_police=layout.font_police, font_size=layout.font_size, border_size=layout.border_size,
             vertical_spacing=layout.configuration.build_order_selection_vertical_spacing,
@@ -515,7 +567,12 @@ class RTSGameOverlay(QMainWindow):
 
         # keyboard and mouse global hotkeys
         self.hotkey_names = ['next_panel', 'show_hide', 'build_order_previous_step', 'build_order_next_step']
-        self.keyboard_mouse = KeyboardMouseManagement(print_unset=False)
+        self.hotkey_input_signal.connect(self.process_hotkeys)  # hotkeys processed as soon as pressed
+        self.keyboard_mouse = KeyboardMouseManagement(print_unset=False, input_callback=self.hotkey_input_signal.emit)
+
+        # latencies from the hotkeys to the display (debug)
+        self.latency_probe = LatencyProbe(stages=['flag', 'update', 'layout', 'paint'],
+                                          enabled=self.settings.latency_probe)
 
         self.mouse_buttons_dict = dict()  # dictionary as {keyboard_name: mouse_button_name}
         self.set_keyboard_mouse()
@@ -572,6 +629,7 @@ class RTSGameOverlay(QMainWindow):
         # scaling the settings
         self.settings = deepcopy(self.unscaled_settings)
         self.settings_scaling()
+        self.latency_probe.enabled = self.settings.latency_probe
 
         # title and icon
         images = self.settings.images
@@ -579,16 +637,20 @@ class RTSGameOverlay(QMainWindow):
         self.game_icon = os.path.join(self.directory_common_pictures, images.game_icon)
         self.setWindowIcon(QIcon(self.game_icon))
 
+        # pictures potentially added or removed
+        refresh_pictures_folder_indexes()
+
         # reset build order selection
         print('Reloading the build orders.')
         self.valid_build_orders = []
         self.build_order_selection_id = 0
         self.selected_build_order = None
         self.selected_build_order_name = None
+        self.selected_build_order_file = None
         self.selected_build_order_step_count = 0
         self.selected_build_order_step_id = -1
-        self.build_orders = get_build_orders(self.directory_build_orders, self.check_valid_build_order,
-                                             category_name=self.build_order_category_name)
+        self.build_order_steps_display = []
+        self.load_build_orders()
 
         # selected username
         self.selected_username = self.settings.username if (len(self.settings.username) > 0) else None
@@ -891,6 +953,9 @@ class RTSGameOverlay(QMainWindow):
         self.stop_application = True
         print('Stopping the application.')
 
+        self.stop_build_orders_loading()
+        self.timer_scheduler.stop()
+
         self.hide()  # hide the application while closing it
         self.config_quit_button.hide()
 
@@ -985,16 +1050,17 @@ class RTSGameOverlay(QMainWindow):
                 button_margin=config.button_margin, vertical_spacing=config.vertical_spacing,
                 horizontal_spacing=config.horizontal_spacing, build_order_website=config.build_order_website)
 
-    def get_hotkey_mouse_flag(self, name: str) -> bool:
-        """Get the flag value for a global hotkey and/or mouse input
+    def is_hotkey_mouse_event(self, name: str, input_event: InputEvent) -> bool:
+        """Check if an input event activates a global hotkey and/or mouse input
 
         Parameters
         ----------
-        name    field to check
+        name           field to check
+        input_event    input event received from the keyboard and mouse listeners
 
         Returns
         -------
-        True if flag activated, False if not activated or not found
+        True if activated, False if not activated or not found
         """
         valid_keyboard = (name in self.keyboard_mouse.keyboard_hotkeys) and (
                 self.keyboard_mouse.keyboard_hotkeys[name].sequence != '')
@@ -1002,18 +1068,17 @@ class RTSGameOverlay(QMainWindow):
         valid_mouse = (mouse_button_name is not None) and (mouse_button_name in self.keyboard_mouse.mouse_button_names)
 
         if valid_keyboard and valid_mouse:  # both mouse and hotkey must be pressed
-            if self.keyboard_mouse.is_keyboard_hotkey_pressed(name) and self.keyboard_mouse.get_mouse_flag(
-                    mouse_button_name):
-                return self.keyboard_mouse.get_mouse_elapsed_time(
-                    mouse_button_name) < self.unscaled_settings.hotkeys.mouse_max_time
+            if input_event.is_mouse and (input_event.name == mouse_button_name) and \
+                    self.keyboard_mouse.keyboard_hotkeys[name].keys.issubset(input_event.pressed_keys):
+                return input_event.get_elapsed_time() < self.unscaled_settings.hotkeys.mouse_max_time
             else:
                 return False
 
         elif valid_keyboard:  # check keyboard
-            return self.keyboard_mouse.get_keyboard_hotkey_flag(name)
+            return (not input_event.is_mouse) and (input_event.name == name)
 
         elif valid_mouse:  # check mouse
-            return self.keyboard_mouse.get_mouse_flag(mouse_button_name)
+            return input_event.is_mouse and (input_event.name == mouse_button_name)
 
         return False  # not set
 
@@ -1021,6 +1086,8 @@ class RTSGameOverlay(QMainWindow):
         """Function called on a timer (related to mouse and keyboard inputs)"""
         self.update_mouse()  # update the mouse position
 
+        self.update_build_orders_loading()  # build orders loaded in parallel thread
+
         # next panel button
         self.next_panel_button.hovering_show(self.is_mouse_in_roi_widget)
 
@@ -1047,21 +1114,58 @@ class RTSGameOverlay(QMainWindow):
         if self.counters_panel is not None:
             self.counters_panel.mouse_hovering(self.mouse_x, self.mouse_y)
 
-        # keyboard action flags
-        if (self.panel_config_hotkeys is None) or (not self.panel_config_hotkeys.isVisible()):
+        self.process_hotkeys()  # in case some input events were not processed yet
+
+    def is_hotkey_action_event(self, name: str, input_event: InputEvent) -> bool:
+        """Check if an input event activates the action of a global hotkey, measuring its latency if so
+
+        Parameters
+        ----------
+        name           field to check
+        input_event    input event received from the keyboard and mouse listeners
+
+        Returns
+        -------
+        True if the action must be performed
+        """
+        if self.is_hotkey_mouse_event(name, input_event):
+            self.latency_probe.start(input_event.timestamp)  # measured from the input
+            self.latency_probe.mark('flag')
+            return True
+        return False
+
+    def process_hotkeys(self):
+        """Perform the actions of the global hotkeys and mouse inputs received since the last call"""
+        input_events = self.keyboard_mouse.get_input_events()  # each input processed only once, in order
+        if (self.panel_config_hotkeys is not None) and self.panel_config_hotkeys.isVisible():
+            return  # inputs discarded while configuring the hotkeys
+
+        for input_event in input_events:
             # switch to next panel
-            if self.get_hotkey_mouse_flag('next_panel'):
+            if self.is_hotkey_action_event('next_panel', input_event):
                 self.next_panel()
 
-            if self.get_hotkey_mouse_flag('show_hide'):  # show/hide overlay
+            if self.is_hotkey_action_event('show_hide', input_event):  # show/hide overlay
                 self.show_hide()
 
-            if self.get_hotkey_mouse_flag('build_order_previous_step'):  # select previous step of the build order
+            # select previous step of the build order
+            if self.is_hotkey_action_event('build_order_previous_step', input_event):
                 self.build_order_previous_step()
 
-            if self.get_hotkey_mouse_flag('build_order_next_step'):  # select next step of the build order
+            # select next step of the build order
+            if self.is_hotkey_action_event('build_order_next_step', input_event):
                 self.build_order_next_step()
 
+    def paintEvent(self, event):
+        """Paint the window
+
+        Parameters
+        ----------
+        event    paint event
+        """
+        super().paintEvent(event)
+        self.latency_probe.mark('paint')
+
     def show_hide(self):
         """Show or hide the windows"""
         self.hidden = not self.hidden  # change the hidden state
@@ -1072,6 +1176,25 @@ class RTSGameOverlay(QMainWindow):
         else:
             self.setWindowOpacity(self.settings.layout.opacity)
 
+        self.timer_scheduler.update()  # timers slower when hidden
+
+    def get_mouse_timer_interval(self) -> int:
+        """Get the interval of the timer related to mouse and keyboard inputs
+
+        Returns
+        -------
+        interval [ms], slower when the overlay is hidden or the mouse away from it
+        """
+        if (self.counters_panel is not None) and self.counters_panel.isVisible():
+            return self.settings.mouse_call_ms
+        elif self.hidden:
+            return self.settings.mouse_idle_call_ms
+        elif self.is_mouse_near_window(self.settings.mouse_near_window_margin) or (
+                self.build_orders_thread_id is not None):  # mouse may hover the window, or loading in progress
+            return self.settings.mouse_call_ms
+        else:
+            return self.settings.mouse_idle_call_ms
+
     def update_hotkeys(self):
         """Update the hotkeys and the settings file"""
         config_hotkeys = self.panel_config_hotkeys.hotkeys
@@ -1141,7 +1264,9 @@ class RTSGameOverlay(QMainWindow):
                 name = build_order_data['name']  # name of the build order
 
                 # check if build order is a new one
-                if is_build_order_new(self.build_orders, build_order_data, self.build_order_category_name):
+                if not self.build_orders.is_valid_key(build_order_data):
+                    msg_text = 'Build order name or category is not valid (not added).'
+                elif self.build_orders.is_new(build_order_data):
 
                     # output filename
                     output_name = f'{name}.json'
@@ -1159,7 +1284,11 @@ class RTSGameOverlay(QMainWindow):
                         with open(out_filename, 'w') as f:
                             f.write(json.dumps(build_order_data, sort_keys=False, indent=4))
                         # add build order to list
-                        self.build_orders.append(build_order_data)
+                        build_order_header = BuildOrderHeader(build_order_data, out_filename)
+                        self.build_orders.add(build_order_header)
+                        if self.build_orders_thread_id is None:  # file already known by the watcher
+                            self.build_order_file_headers[out_filename] = build_order_header
+                            self.build_order_files_state[out_filename] = get_file_state(out_filename)
                         # clear input
                         self.panel_add_build_order.text_input.clear()
                         msg_text = f'Build order \'{name}\' added and saved as \'{out_filename}\'.'
@@ -1223,6 +1352,20 @@ class RTSGameOverlay(QMainWindow):
         """
         return self.is_mouse_in_roi(self.x(), self.y(), self.width(), self.height())
 
+    def is_mouse_near_window(self, margin: int) -> bool:
+        """Checks if the mouse is in the current window or close to it
+
+        Parameters
+        ----------
+        margin    maximal distance to the window [px]
+
+        Returns
+        -------
+        True if mouse is in the window extended by the margin
+        """
+        return self.is_mouse_in_roi(self.x() - margin, self.y() - margin, self.width() + 2 * margin,
+                                    self.height() + 2 * margin)
+
     def is_mouse_in_roi_widget(self, widget: QWidget) -> bool:
         """Check if the last updated mouse position (using 'update_mouse') is in the ROI of a widget
 
@@ -1344,6 +1487,155 @@ class RTSGameOverlay(QMainWindow):
             return True
         return False
 
+    def load_build_orders(self):
+        """Start loading the build orders in a parallel thread (stopping the previous loading)"""
+        self.stop_build_orders_loading()
+        self.stop_build_orders_watcher()
+
+        self.build_orders = BuildOrderRegistry(self.build_order_category_name)
+        self.store_build_orders = []
+        self.loaded_build_order_files_state = dict()
+        self.build_orders_stop_flag = Event()
+        self.build_orders_thread_id = get_build_orders_threading(
+            self.directory_build_orders, self.check_valid_build_order, self.store_build_orders,
+            stop_event=self.build_orders_stop_flag, category_name=self.build_order_category_name,
+            cache_file=self.build_orders_cache_file, workers=self.settings.build_order_loading_workers,
+            files_state=self.loaded_build_order_files_state)
+
+    def stop_build_orders_loading(self):
+        """Stop the build orders loading thread, if running"""
+        if self.build_orders_thread_id is not None:
+            self.build_orders_stop_flag.set()
+            self.build_orders_thread_id.join()
+            self.build_orders_thread_id = None
+
+    def update_build_orders_loading(self):
+        """Add the build orders loaded by the parallel thread since the last call"""
+        if self.build_orders_thread_id is None:  # no loading in progress
+            return
+
+        loaded_count = len(self.store_build_orders)
+        if loaded_count > 0:
+            loading_states = self.store_build_orders[:loaded_count]
+            del self.store_build_orders[:loaded_count]  # the thread may append new elements meanwhile
+
+            new_build_orders = False  # True if at least one build order added
+            for processed_count, file_count, build_order in loading_states:
+                if build_order is not None:
+                    self.build_orders.add(build_order)
+                    new_build_orders = True
+            self.build_order_search.setPlaceholderText(f'loading {processed_count}/{file_count}')
+
+            # update the current search with the new build orders
+            if new_build_orders and self.build_order_search.isVisible() and (self.build_order_search.text() != ''):
+                self.update_build_order_display()
+
+        if (not self.build_orders_thread_id.is_alive()) and (len(self.store_build_orders) == 0):  # loading done
+            self.build_orders_thread_id = None
+            self.build_order_search.setPlaceholderText('')
+            print(f'{len(self.build_orders)} build orders loaded.')
+            self.start_build_orders_watcher()
+
+    def start_build_orders_watcher(self):
+        """Start watching the build order files (once the build orders are loaded)"""
+        # files as they were read by the loading thread, to catch the changes made while loading
+        self.build_order_files_state = self.loaded_build_order_files_state
+        self.build_order_file_headers = {build_order.file: build_order for build_order in self.build_orders}
+        self.build_orders_watcher_timer.setInterval(self.settings.build_order_watcher_ms)
+        self.update_build_orders_watcher_paths()
+        self.update_build_order_files()  # files changed since they were read
+
+    def stop_build_orders_watcher(self):
+        """Stop watching the build order files"""
+        self.build_orders_watcher_timer.stop()
+        watched_paths = self.build_orders_watcher.files() + self.build_orders_watcher.directories()
+        if len(watched_paths) > 0:
+            self.build_orders_watcher.removePaths(watched_paths)
+        self.build_order_files_state = dict()
+        self.build_order_file_headers = dict()
+
+    def update_build_orders_watcher_paths(self):
+        """Watch the build orders folders (for files added or removed) and files (for files modified)"""
+        paths = set(root for root, _, _ in os.walk(self.directory_build_orders))
+        paths.update(self.build_order_files_state.keys())
+        watched_paths = set(self.build_orders_watcher.files() + self.build_orders_watcher.directories())
+        if len(watched_paths - paths) > 0:
+            self.build_orders_watcher.removePaths(list(watched_paths - paths))
+        if len(paths - watched_paths) > 0:
+            self.build_orders_watcher.addPaths(list(paths - watched_paths))
+
+    def build_order_files_changed(self, _):
+        """Build order file or folder changed, updated after a delay (to group the changes)"""
+        self.build_orders_watcher_timer.start()  # restart the delay if already running
+
+    def update_build_order_files(self):
+        """Update the build orders of the files added, modified or removed since the last update"""
+        if self.build_orders_thread_id is not None:  # loading in progress, files checked when the watcher starts
+            return
+
+        old_state = self.build_order_files_state
+        new_state = get_build_order_files_state(self.directory_build_orders)
+        outdated_files = [x for x in old_state if new_state.get(x) != old_state[x]]  # removed or modified
+        read_files = [x for x in new_state if new_state[x] != old_state.get(x, False)]  # new or modified
+        self.build_order_files_state = new_state
+        self.update_build_orders_watcher_paths()
+        if (len(outdated_files) == 0) and (len(read_files) == 0):
+            return
+
+        for build_order_file in outdated_files:
+            build_order_header = self.build_order_file_headers.pop(build_order_file, None)
+            if build_order_header is not None:
+                self.build_orders.remove(build_order_header)
+
+        for build_order_file in read_files:
+            try:
+                read_result = read_build_order_file(build_order_file, self.check_valid_build_order,
+                                                    self.build_order_category_name)
+                build_order_header = add_read_build_order(self.build_orders, build_order_file, read_result)
+            except OSError:  # file removed meanwhile
+                continue
+            except Exception as e:  # unexpected content (called from the watcher timer: must not raise)
+                print(f'Could not read the build order file \'{build_order_file}\' ({e}), skipping it.')
+                continue
+            if build_order_header is not None:
+                self.build_order_file_headers[build_order_file] = build_order_header
+        print(f'Build order files updated: {len(outdated_files)} removed or modified, {len(read_files)} read.')
+
+        # selected build order modified
+        if (self.selected_build_order is not None) and (self.selected_build_order_file in read_files):
+            self.refresh_selected_build_order()
+
+        # update the current search
+        if self.build_order_search.isVisible() and (self.build_order_search.text() != ''):
+            self.update_build_order_display()
+
+    def refresh_selected_build_order(self):
+        """Load the selected build order again (after its file was modified)"""
+        build_order_header = self.build_order_file_headers.get(self.selected_build_order_file)
+        if (build_order_header is None) or (build_order_header['name'] != self.selected_build_order_name):
+            return  # not valid anymore or renamed: keep the current version
+
+        selected_build_order = build_order_header.load(self.check_valid_build_order)
+        if selected_build_order is not None:
+            self.selected_build_order = selected_build_order
+            self.selected_build_order_step_count = len(selected_build_order['build_order'])
+            self.selected_build_order_step_id = min(self.selected_build_order_step_id,
+                                                    self.selected_build_order_step_count - 1)
+            self.prepare_build_order_steps()
+            self.update_panel_elements()
+
+    def get_build_orders_search_index(self) -> BuildOrderSearchIndex:
+        """Get the search index of the build orders, indexing them again only if they changed
+
+        Returns
+        -------
+        search index of the current build orders
+        """
+        if (self.build_orders_search_index is None) or (
+                not self.build_orders_search_index.is_up_to_date(self.build_orders)):
+            self.build_orders_search_index = BuildOrderSearchIndex(self.build_orders)
+        return self.build_orders_search_index
+
     def get_valid_build_orders(self, key_condition: dict = None):
         """Get the names of the valid build orders (with search bar)
 
@@ -1353,47 +1645,27 @@ class RTSGameOverlay(QMainWindow):
         """
         self.valid_build_orders = []  # reset the list
         build_order_search_string = self.build_order_search.text()
+        self.build_order_searched_text = build_order_search_string
 
         if build_order_search_string == '':  # no text added
             return
 
-        # only keep build orders with valid key conditions
-        if key_condition is not None:
-            valid_key_build_orders = [build_order for build_order in self.build_orders if
-                                      check_build_order_key_values(build_order, key_condition)]
-        else:
-            valid_key_build_orders = self.build_orders
-
         configuration = self.settings.layout.configuration
         if build_order_search_string == ' ':  # special case: select any build order, up to the limit count
-            for count, build_order in enumerate(valid_key_build_orders):
+            # only keep build orders with valid key conditions
+            for count, build_order in enumerate(self.build_orders.get_matching(key_condition)):
                 if count >= configuration.bo_list_max_count:
                     break
                 self.valid_build_orders.append(build_order['name'])
 
         elif configuration.bo_list_fuzz_search:  # do a fuzzy search for matching build orders
-            self.valid_build_orders = [match[0] for match in process.extractBests(
-                build_order_search_string,
-                [build_order['name'] for build_order in valid_key_build_orders],
-                score_cutoff=configuration.bo_list_fuzz_score_cutoff,
-                limit=configuration.bo_list_max_count
-            )]
+            self.valid_build_orders = self.get_build_orders_search_index().search(
+                build_order_search_string, score_cutoff=configuration.bo_list_fuzz_score_cutoff,
+                limit=configuration.bo_list_max_count, key_condition=key_condition)
 
         else:  # search by splitting the words
-            search_split = build_order_search_string.split(' ')  # split according to spaces
-
-            for build_order in self.build_orders:
-                if len(self.valid_build_orders) >= configuration.bo_list_max_count:
-                    break
-
-                valid_name = True  # assumes valid name
-                build_order_name = build_order['name']
-                for search_part in search_split:  # loop on the sub-parts to find
-                    if search_part.lower() not in build_order_name.lower():
-                        valid_name = False
-                        break
-                if valid_name:  # add valid build order
-                    self.valid_build_orders.append(build_order_name)
+            self.valid_build_orders = self.get_build_orders_search_index().search_words(
+                build_order_search_string, limit=configuration.bo_list_max_count)
 
         # check all elements are unique
         assert len(set(self.valid_build_orders)) == len(self.valid_build_orders)
@@ -1402,6 +1674,31 @@ class RTSGameOverlay(QMainWindow):
         if self.build_order_selection_id >= len(self.valid_build_orders):
             self.build_order_selection_id = max(0, len(self.valid_build_orders) - 1)
 
+    def build_order_search_changed(self):
+        """Text of the build order search bar changed: delay the search until typing pauses"""
+        self.build_order_search_timer.start(self.settings.layout.configuration.bo_list_search_delay_ms)
+
+    def run_build_order_search(self):
+        """Run the delayed build order search, unless already done for the current text"""
+        if self.build_order_search.text() != self.build_order_searched_text:
+            self.update_build_order_display()
+
+    def flush_build_order_search(self):
+        """Run the pending build order search immediately (if any)"""
+        if self.build_order_search_timer.isActive():
+            self.build_order_search_timer.stop()
+            self.run_build_order_search()
+
+    def set_build_order_search_text(self, text: str):
+        """Set the text of the build order search bar, and update the search immediately
+
+        Parameters
+        ----------
+        text    new text of the search bar
+        """
+        self.build_order_search.setText(text)
+        self.flush_build_order_search()
+
     def obtain_build_order_search(self, key_condition: dict = None):
         """Obtain the valid build order from search bar
 
@@ -1434,37 +1731,70 @@ class RTSGameOverlay(QMainWindow):
         ----------
         key_condition   dictionary with the keys to look for and their value (to consider as valid), None to skip it
         """
+        self.flush_build_order_search()  # select among the results of the current search text
         self.build_order_selection.clear()
 
+        selected_build_order = None  # full data of the selected build order
         if len(self.valid_build_orders) > 0:  # valid
             assert 0 <= self.build_order_selection_id < len(self.valid_build_orders)
-            self.selected_build_order_name = self.valid_build_orders[self.build_order_selection_id]
+            build_order_header = self.build_orders.get(
+                self.valid_build_orders[self.build_order_selection_id], key_condition)
+            assert build_order_header is not None
+            selected_build_order = build_order_header.load(self.check_valid_build_order)  # steps loaded once selected
 
-            self.selected_build_order = None
-            for build_order in self.build_orders:
-                if (build_order['name'] == self.selected_build_order_name) and check_build_order_key_values(
-                        build_order, key_condition):
-                    self.selected_build_order = build_order
-                    break
-            assert self.selected_build_order is not None
+        if selected_build_order is not None:  # valid
+            self.selected_build_order = selected_build_order
+            self.selected_build_order_name = selected_build_order['name']
+            self.selected_build_order_file = build_order_header.file
 
             self.selected_build_order_step_id = 0
             self.selected_build_order_step_count = len(self.selected_build_order['build_order'])
             assert self.selected_build_order_step_count > 0
+            self.prepare_build_order_steps()
 
-            self.build_order_search.setText('')
+            self.set_build_order_search_text('')
             self.build_order_selection.add_row_from_picture_line(
                 parent=self, line=self.selected_build_order_name, labels_settings=[QLabelSettings(
                     text_bold=True, text_color=self.settings.layout.configuration.selected_build_order_color)])
         else:  # not valid
             self.selected_build_order = None
             self.selected_build_order_name = None
+            self.selected_build_order_file = None
             self.selected_build_order_step_count = 0
             self.selected_build_order_step_id = -1
+            self.build_order_steps_display = []
             self.build_order_selection.clear()
             self.build_order_selection.add_row_from_picture_line(parent=self, line='no build order')
         self.build_order_search.clearFocus()
 
+    def get_build_order_resources_line(self, selected_step: dict) -> (str, Optional[dict]):
+        """Get the line displaying the resources of a build order step (specific to each game)
+
+        Parameters
+        ----------
+        selected_step    build order step
+
+        Returns
+        -------
+        line with images between @ markers, '' if nothing to display
+        tooltips mapping parts of the line to their content, None if no tooltip
+        """
+        return '', None
+
+    def prepare_build_order_steps(self):
+        """Prepare the display of all the steps of the selected build order, so that changing step is only a swap"""
+        self.build_order_steps_display = []
+        if self.selected_build_order is None:
+            return
+
+        for step_id, selected_step in enumerate(self.selected_build_order['build_order']):
+            resources_line, resources_tooltips = self.get_build_order_resources_line(selected_step)
+            self.build_order_steps_display.append(BuildOrderStepDisplay(
+                step_text=f'Step: {step_id + 1}/{self.selected_build_order_step_count}',
+                resources_line=self.build_order_resources.prepare_picture_line(resources_line),
+                resources_tooltips=resources_tooltips,
+                notes_lines=[self.build_order_notes.prepare_picture_line(note) for note in selected_step['notes']]))
+
     def select_username(self, username: str = None):
         """Select the username
 
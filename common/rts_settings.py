@@ -17,6 +17,7 @@ class RTSConfigurationLayout(SettingsSubclass):
         self.bo_list_max_count: int = 10  # maximum count of valid build orders in the selection list
         self.bo_list_fuzz_search: bool = True  # True to use fuzzy search, False for splitting words search
         self.bo_list_fuzz_score_cutoff: int = 50  # score cutoff parameter for the fuzzy search
+        self.bo_list_search_delay_ms: int = 30  # delay after the last typed character before searching [ms]
 
 
 class RTSConfigurationUsernameLayout(RTSConfigurationLayout):
@@ -178,3 +179,8 @@ class RTSOverlaySettings(SettingsSubclass):
         self.panel_build_order = RTSBuildOrderInputLayout()  # panel to input a build order
 
         self.mouse_call_ms = 20  # interval between 2 calls related to mouse motion [ms]
+        self.mouse_idle_call_ms = 250  # same, when the overlay is hidden or the mouse away from it [ms]
+        self.mouse_near_window_margin = 100  # distance to the overlay below which the mouse is close to it [px]
+        self.build_order_loading_workers = 1  # number of processes loading the build orders (1 for no extra process)
+        self.build_order_watcher_ms = 300  # delay to update the build orders after their files changed [ms]
+        self.latency_probe = False  # True to print the latencies from the hotkeys to the display (debug)
@@ -0,0 +1,49 @@
+from PyQt6.QtCore import QTimer
+
+
+class TimerScheduler:
+    """Timers of the overlay, with intervals adapted to its state (faster, slower or paused)"""
+
+    def __init__(self):
+        """Constructor"""
+        self.timers = []  # timers as [(QTimer, interval function), ...]
+
+    def add_timer(self, callback, get_interval):
+        """Add a timer, started according to its interval
+
+        Parameters
+        ----------
+        callback        function called when the timer is triggered
+        get_interval    function returning the current interval of the timer [ms], None to pause it
+        """
+        timer = QTimer()
+        timer.timeout.connect(callback)
+        timer.timeout.connect(self.update)  # the state may have changed during the call
+        self.timers.append((timer, get_interval))
+        self.update_timer(timer, get_interval)
+
+    @staticmethod
+    def update_timer(timer: QTimer, get_interval):
+        """Update the interval of a timer, pausing or restarting it if needed
+
+        Parameters
+        ----------
+        timer           timer to update
+        get_interval    function returning the current interval of the timer [ms], None to pause it
+        """
+        interval = get_interval()
+        if interval is None:  # pause
+            if timer.isActive():
+                timer.stop()
+        elif (not timer.isActive()) or (timer.interval() != interval):  # (re)start with the current interval
+            timer.start(interval)
+
+    def update(self):
+        """Update all the timers according to the current state"""
+        for timer, get_interval in self.timers:
+            self.update_timer(timer, get_interval)
+
+    def stop(self):
+        """Stop all the timers"""
+        for timer, _ in self.timers:
+            timer.stop()
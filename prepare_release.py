@@ -1,8 +1,14 @@
 # Prepare the release library
 import os
+import sys
 import shutil
 from subprocess import Popen, PIPE
 
+from PyQt6.QtGui import QGuiApplication
+
+from common.asset_pack import build_asset_pack
+from common.rts_settings import RTSBuildOrderLayout
+
 
 def compile_clean(name_overlay: str, game_folder: str, out_lib_name: str,
                   disable_console: bool = True, finalize_folder: bool = False,
@@ -19,6 +25,10 @@ def compile_clean(name_overlay: str, game_folder: str, out_lib_name: str,
     """
     icon = 'pictures/common/icon/salamander_sword_shield.ico'  # icon for the library
 
+    # pre-scale the pictures to the default build order image height (packed inside the pictures folders)
+    for pictures_folder in ['pictures/common', f'pictures/{game_folder}']:
+        build_asset_pack(pictures_folder, image_heights=[RTSBuildOrderLayout().image_height])
+
     # main nuitka command to run
     if macos:
         main_command = f"python -m nuitka --macos-create-app-bundle --macos-app-icon={icon}"
@@ -78,6 +88,8 @@ def compile_clean(name_overlay: str, game_folder: str, out_lib_name: str,
 
 
 if __name__ == '__main__':
+    app = QGuiApplication(sys.argv)  # needed to scale the pictures
+
     # name of the output libraries
     macos = False
     aoe2_library_name = 'aoe2_overlay'
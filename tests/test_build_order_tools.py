@@ -0,0 +1,74 @@
+# Check that the build order files with unexpected content are skipped when loading them
+# run from the root folder: python -m unittest tests.test_build_order_tools
+import io
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from contextlib import redirect_stdout
+
+from common.build_order_tools import BuildOrderRegistry, read_build_order_file, add_read_build_order, \
+    get_build_orders
+from aoe2.aoe2_build_order import check_valid_aoe2_build_order
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent
+
+
+class TestBuildOrderFiles(unittest.TestCase):
+    """Build order files whose JSON content is not a build order"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_file(self, file_name: str, content) -> str:
+        """Write a JSON file in the temporary directory
+
+        Parameters
+        ----------
+        file_name    name of the file
+        content      content to store as JSON
+
+        Returns
+        -------
+        path of the file
+        """
+        build_order_file = os.path.join(self.directory, file_name)
+        with open(build_order_file, 'w') as f:
+            json.dump(content, f)
+        return build_order_file
+
+    def test_unexpected_content(self):
+        """Empty dictionary, array and scalar content, read and added to a registry"""
+        for category_name in [None, 'civilization']:
+            for content in [{}, [1, 2], 5]:
+                build_order_file = self.write_file('unexpected.json', content)
+                build_orders = BuildOrderRegistry(category_name)
+                with redirect_stdout(io.StringIO()) as output:
+                    read_result = read_build_order_file(build_order_file, check_valid_aoe2_build_order, category_name)
+                    self.assertFalse(read_result[1])
+                    self.assertIsNone(add_read_build_order(build_orders, build_order_file, read_result))
+                self.assertIn('skipping it', output.getvalue(), msg=f'content {content}, category {category_name}')
+                self.assertEqual(len(build_orders), 0)
+
+    def test_loading_with_unexpected_content(self):
+        """Files with unexpected content skipped, the other build orders being loaded (with and without workers)"""
+        source_folder = ROOT_FOLDER / 'build_orders' / 'aoe2'
+        build_order_files = sorted(x for x in os.listdir(source_folder) if x.endswith('.json'))[:4]
+        for file_name in build_order_files:
+            shutil.copy(source_folder / file_name, self.directory)
+        for file_id, content in enumerate([{}, [1, 2], 5, {'name': 5}]):
+            self.write_file(f'unexpected_{file_id}.json', content)
+
+        with redirect_stdout(io.StringIO()):
+            for workers in [1, 2]:
+                build_orders = get_build_orders(self.directory, check_valid_aoe2_build_order, workers=workers)
+                self.assertEqual(len(build_orders), len(build_order_files), msg=f'{workers} workers')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# Check that the batched fuzzy scorer ranks the choices as 'thefuzz.process.extractBests'
+# run from the root folder: python -m unittest tests.test_fuzzy_search
+import os
+import json
+import random
+import logging
+import unittest
+from pathlib import Path
+from thefuzz import process
+
+from common.fuzzy_search import FuzzyScorer
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent
+
+
+def get_build_order_names() -> list:
+    """Get the names of the build orders provided with the application
+
+    Returns
+    -------
+    names of the build orders
+    """
+    names = []
+    for root, _, files in os.walk(ROOT_FOLDER / 'build_orders'):
+        for file_name in sorted(files):
+            if file_name.endswith('.json'):
+                with open(os.path.join(root, file_name), 'rb') as f:
+                    data = json.load(f)
+                if isinstance(data.get('name'), str):
+                    names.append(data['name'])
+    return names
+
+
+def get_unit_names() -> list:
+    """Get the names of the units of the counters search
+
+    Returns
+    -------
+    names of the units
+    """
+    with open(ROOT_FOLDER / 'aoe2' / 'unit_counters.json', 'r') as f:
+        return list(json.load(f).keys())
+
+
+class TestFuzzyScorer(unittest.TestCase):
+    """Comparison of FuzzyScorer with 'thefuzz.process.extractBests'"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.WARNING)  # 'thefuzz' warning for queries empty after processing
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def check_same_ranking(self, choices: list, query: str, score_cutoff: int, limit: int, choice_ids: list = None):
+        """Check that the scorer (both backends) returns the same ranking as 'thefuzz'
+
+        Parameters
+        ----------
+        choices         strings to search in
+        query           string to search
+        score_cutoff    minimal score of the returned choices
+        limit           maximal number of choices returned
+        choice_ids      IDs (increasing) of the choices to score, None for all of them
+        """
+        ids = list(range(len(choices))) if (choice_ids is None) else choice_ids
+        expected = [match[0] for match in process.extractBests(
+            query, [choices[x] for x in ids], score_cutoff=score_cutoff, limit=limit)]
+        for use_batch in [True, False]:
+            scorer = FuzzyScorer(choices, use_batch=use_batch)
+            self.assertEqual(scorer.extract(query, score_cutoff, limit, choice_ids), expected,
+                             msg=f'query \'{query}\', cutoff {score_cutoff}, batch {use_batch}')
+
+    def test_random_queries(self):
+        """Random queries made of name parts, on random subsets of the build order and unit names"""
+        generator = random.Random(0)
+        for choices in [get_build_order_names(), get_unit_names()]:
+            self.assertGreater(len(choices), 0)
+            words = ' '.join(choices).split()
+            for _ in range(300):
+                query = ' '.join(generator.choice(words)[:generator.randint(1, 8)]
+                                 for _ in range(generator.randint(1, 3)))
+                choice_ids = sorted(generator.sample(range(len(choices)), generator.randint(1, len(choices))))
+                for score_cutoff in [0, 50, 80]:
+                    self.check_same_ranking(choices, query, score_cutoff, limit=10)
+                    self.check_same_ranking(choices, query, score_cutoff, limit=10, choice_ids=choice_ids)
+
+    def test_empty_processed_query(self):
+        """Queries without letters or numbers (empty after processing)"""
+        choices = get_build_order_names()
+        for query in ['', ' ', '[', '!!!', 'é']:
+            for score_cutoff in [0, 50]:
+                self.check_same_ranking(choices, query, score_cutoff, limit=10)
+
+    def test_ties(self):
+        """Choices with equal scores, kept in their order"""
+        choices = ['fast castle', 'Fast Castle', 'fast-castle', 'castle fast', 'fast castle', 'drush fc', 'Éfast castle']
+        for query in ['fast castle', 'castle', 'fc', 'FAST']:
+            for score_cutoff in [0, 50]:
+                self.check_same_ranking(choices, query, score_cutoff, limit=3)
+                self.check_same_ranking(choices, query, score_cutoff, limit=10)
+                self.check_same_ranking(choices, query, score_cutoff, limit=10, choice_ids=[1, 2, 4, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()